@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""Shared container for per-candidate detection results used by the tuners"""
+
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+
+@dataclass
+class DetectionArrays:
+    """Base for detection results stored as parallel arrays, one entry per candidate.
+    
+    Subclasses declare one np.ndarray field per attribute, including a 'total' score.
+    """
+    
+    def __len__(self):
+        return len(self.total)
+    
+    def sorted_by_score(self):
+        """Return a copy ordered by descending total score"""
+        order = np.argsort(-self.total, kind='stable')
+        return type(self)(*[getattr(self, f.name)[order] for f in fields(self)])
@@ -87,9 +87,9 @@ class ProximityLED:
         value = int(brightness_percent * 255 / 100)
         print(f"DEBUG: Setting all LEDs to {brightness_percent}% (value: {value})")
         try:
-            # Set all LEDs to the same white color
-            for i in range(self.strip.numPixels()):
-                self.strip.setPixelColor(i, Color(value, value, value))
+            # Set all LEDs to the same white color (Color() built once, not per pixel)
+            color = Color(value, value, value)
+            self.strip[:] = color  # No Python loop here; rpi_ws281x still sets each pixel internally
             self.strip.show()
             print("DEBUG: LED brightness set successfully")
         except Exception as e:
@@ -2,6 +2,9 @@
 
 import os
 import time
+import threading
+import queue
+from collections import deque
 import numpy as np
 from typing import Tuple, Optional
 import cv2
@@ -12,6 +15,11 @@ import RPi.GPIO as GPIO
 from rpi_ws281x import PixelStrip, Color
 from datetime import datetime
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # Fall back to the vectorized NumPy scan
+
 # Import JEOresearch EyeTracker functions
 import sys
 sys.path.append('./EyeTracker')
@@ -39,6 +47,54 @@ IR_LED_PIN = 13     # GPIO pin for IR LED (PWM1)
 IR_LED_FREQ = 100   # PWM frequency for IR LED
 STABLE_THRESHOLD = 3  # Maximum allowed pupil size variation to consider stable (in pixels) - more stringent
 STABLE_FRAMES = 10   # Number of frames pupil size must be stable for - more frames for stability
+TRACK_WINDOW = 100    # Half-size of the darkest-area search around the last pupil (pixels)
+TRACK_MAX_MISSES = 3  # Consecutive misses before searching the whole frame again
+CAPTURE_INTERVAL = 0.1  # Seconds between measurement frames (paces the stability window)
+
+
+def _darkest_window_numpy(gray, x_start, x_stop, y_start, y_stop, step, search_area, internal_step):
+    """Return the top-left (x, y) of the sampled window with the lowest pixel sum"""
+    height, width = gray.shape
+    ys = np.arange(y_start, y_stop, step)
+    xs = np.arange(x_start, x_stop, step)
+    if ys.size == 0 or xs.size == 0:
+        return -1, -1
+    offsets = np.arange(0, search_area, internal_step)
+    rows = ys[:, None] + offsets
+    cols = xs[:, None] + offsets
+    # Gather every window's samples at once as (row, row offset, col, col offset);
+    # samples past the image edge are zeroed, as the loop version stops there
+    samples = gray[np.minimum(rows, height - 1)][:, :, np.minimum(cols, width - 1)]
+    inside = (rows < height)[:, :, None, None] & (cols < width)[None, None, :, :]
+    sums = np.where(inside, samples, 0).sum(axis=(1, 3), dtype=np.int64)
+    iy, ix = divmod(int(np.argmin(sums)), xs.size)  # First minimum in scan order
+    return int(xs[ix]), int(ys[iy])
+
+
+def _darkest_window_loop(gray, x_start, x_stop, y_start, y_stop, step, search_area, internal_step):
+    """Plain loop version of _darkest_window_numpy, compiled with numba"""
+    height, width = gray.shape
+    min_sum = -1
+    best_x = -1
+    best_y = -1
+    for y in range(y_start, y_stop, step):
+        for x in range(x_start, x_stop, step):
+            current_sum = 0
+            for dy in range(0, search_area, internal_step):
+                if y + dy >= height:
+                    break
+                for dx in range(0, search_area, internal_step):
+                    if x + dx >= width:
+                        break
+                    current_sum += gray[y + dy, x + dx]
+            if min_sum < 0 or current_sum < min_sum:
+                min_sum = current_sum
+                best_x = x
+                best_y = y
+    return best_x, best_y
+
+
+_darkest_window = njit(cache=True)(_darkest_window_loop) if njit else _darkest_window_numpy
 
 class CustomOutput(FileOutput):
     """Custom output that can handle overlay frames"""
@@ -64,20 +120,55 @@ class SimplePupilMeasurement:
         self.current_ir_duty = 0  # Track current IR LED duty cycle
         self.gpio_initialized = False  # Track GPIO initialization
         
+        # JPEG encoding and disk writes happen on a writer thread so they overlap
+        # with capture and detection; the bounded queue applies backpressure
+        self.write_queue = queue.Queue(maxsize=8)
+        
+        # Capture/detection and OpenCV's worker pool (which inherits this mask) get all
+        # but one core; the frame writer is pinned to the one left over
+        cores = sorted(os.sched_getaffinity(0))
+        writer_cores = set(cores)
+        if len(cores) > 1:
+            writer_cores = {cores[0]}
+            cv2.setNumThreads(len(cores) - 1)
+            os.sched_setaffinity(0, cores[1:])
+        threading.Thread(target=self.frame_writer, args=(writer_cores,), daemon=True).start()
+        
         # Always start recording to save all frames
         self.start_recording()
         
         self.setup_camera()
         self.setup_gpio()
-        self.last_pupil_sizes = []
+        self.last_pupil_sizes = deque(maxlen=STABLE_FRAMES)  # Oldest size drops off automatically
+        self._size_sum = 0    # Running sum and sum of squares of last_pupil_sizes
+        self._size_sumsq = 0
+        self.last_pupil_center = None  # Where to look first on the next frame
+        self._dilate_kernel = np.ones((5, 5), np.uint8)  # JEO dilation kernel, built once
+        self._dilated = None  # Dilation output, reused while the crop size stays the same
+        self.missed_frames = 0
+        self.frame_times = deque(maxlen=30)  # Recent frame timestamps for the FPS readout
+        self.last_status_time = 0.0
+        
+        # A capture thread keeps the newest (frame, gray_frame) pair ready while measuring,
+        # so waiting for the camera overlaps with detection instead of adding to it
+        self.frame_queue = queue.Queue(maxsize=1)
+        self.capture_enabled = threading.Event()
+        self.capture_running = True  # Cleared by cleanup() to end the capture thread
+        self.capture_thread = threading.Thread(target=self.capture_loop, daemon=True)
+        self.capture_thread.start()
         
     def setup_camera(self):
         """Initialize camera - use exact working method"""
         print("Setting up camera...")
         self.camera = Picamera2()
         
-        # Use the exact same configuration that works
-        preview_config = self.camera.create_preview_configuration(main={"size": (640, 480)})
+        # Use the exact same configuration that works, but ask for "RGB888" (laid out
+        # as [B, G, R]) so frames arrive 3-channel in OpenCV order instead of XBGR.
+        # The YUV420 lores stream gives detection its greyscale (Y plane) directly.
+        preview_config = self.camera.create_preview_configuration(
+            main={"size": (640, 480), "format": "RGB888"},
+            lores={"size": (640, 480), "format": "YUV420"},
+            buffer_count=2)  # Preview default is 4; fewer queued buffers means fresher frames
         self.camera.configure(preview_config)
         
         # Start with or without preview based on option
@@ -107,6 +198,7 @@ class SimplePupilMeasurement:
             # Setup LEDs
             self.strip = PixelStrip(LED_COUNT, LED_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, LED_CHANNEL)
             self.strip.begin()
+            self.strip_color = None  # Color currently held in the strip's pixel buffer
             self.set_all_color(0, 0, 0)  # Start with LEDs off
             self.gpio_initialized = True
             print("GPIO setup complete")
@@ -139,6 +231,7 @@ class SimplePupilMeasurement:
             return
             
         self.recording = False
+        self.write_queue.join()  # Make sure every frame is on disk before ffmpeg runs
         print(f"Converting {self.frame_count} frames to video...")
         
         try:
@@ -176,7 +269,7 @@ class SimplePupilMeasurement:
         """Save frame as individual image file - always save regardless of recording flag"""
         if self.recording:
             frame_filename = f"{self.recording_dir}/frame_{self.frame_count:06d}.jpg"
-            cv2.imwrite(frame_filename, frame)
+            self.write_queue.put((frame_filename, frame))
             self.frame_count += 1
             
             # Print progress every 50 frames
@@ -186,12 +279,25 @@ class SimplePupilMeasurement:
             # Even when not recording, save frames if directory exists
             if self.recording_dir and os.path.exists(self.recording_dir):
                 frame_filename = f"{self.recording_dir}/frame_{self.frame_count:06d}.jpg"
-                cv2.imwrite(frame_filename, frame)
+                self.write_queue.put((frame_filename, frame))
                 self.frame_count += 1
             
+    def frame_writer(self, cores):
+        """Writer thread: encode and save frames queued by write_frame_to_video"""
+        os.sched_setaffinity(0, cores)  # On Linux this pins only the calling thread
+        while True:
+            frame_filename, frame = self.write_queue.get()
+            try:
+                cv2.imwrite(frame_filename, frame)
+            except Exception as e:
+                print(f"Error writing {frame_filename}: {e}")
+            finally:
+                self.write_queue.task_done()
+                
     def add_debug_overlay(self, frame, pupil_x=None, pupil_y=None, pupil_radius=None, ellipse=None):
         """Add debug overlay to frame with measurement information - matches JEOresearch visualization"""
-        overlay_frame = frame.copy()
+        # Draw in place: callers only keep the annotated frame, so a copy is wasted
+        overlay_frame = frame
         
         # Add phase information
         cv2.putText(overlay_frame, f"Phase: {self.current_phase}", (10, 30),
@@ -246,9 +352,10 @@ class SimplePupilMeasurement:
         """Set all LEDs to specified RGB color with brightness percentage"""
         brightness = int((brightness_percent / 100.0) * 255)
         color = Color(red, green, blue)
-        for i in range(LED_COUNT):
-            self.strip.setPixelColor(i, color)
-            self.strip.setBrightness(brightness)
+        self.strip.setBrightness(brightness)  # Global setting, once per update
+        if color != self.strip_color:  # Brightness-only changes keep the pixels as they are
+            self.strip[:] = color  # No Python loop here; rpi_ws281x still sets each pixel internally
+            self.strip_color = color
         self.strip.show()
         
     def set_ir_led(self, duty_cycle: float):
@@ -258,37 +365,103 @@ class SimplePupilMeasurement:
             self.current_ir_duty = duty_cycle
             print(f"IR LED set to {duty_cycle}%")
         
-    def detect_pupil(self, frame: np.ndarray) -> Tuple[Optional[int], Optional[int], Optional[int], Optional[tuple]]:
+    def capture_frames(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Capture one request: colour frame for overlay/recording, greyscale for detection"""
+        request = self.camera.capture_request()
+        try:
+            frame = request.make_array("main")
+            # A YUV420 buffer starts with the full-resolution Y (luma) plane
+            gray_frame = request.make_array("lores")[:480, :640]
+        finally:
+            request.release()
+        return frame, gray_frame
+        
+    def capture_loop(self):
+        """Capture thread: replace the queued frame pair with a new one every CAPTURE_INTERVAL"""
+        next_capture = 0.0
+        while self.capture_running:
+            # Time out now and then so cleanup() can stop the thread while capture is disabled
+            if not self.capture_enabled.wait(timeout=0.5):
+                continue
+            delay = next_capture - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)  # Only copy out the frames the measurement loop will use
+            next_capture = time.monotonic() + CAPTURE_INTERVAL
+            try:
+                frames = self.capture_frames()
+            except Exception as e:
+                # Keep the thread alive; the measurement loop just waits for the next pair
+                print(f"Frame capture error: {e}")
+                continue
+            try:
+                self.frame_queue.get_nowait()  # Drop the pair detection didn't get to
+            except queue.Empty:
+                pass
+            self.frame_queue.put(frames)
+            
+    def start_capture(self):
+        """Start filling frame_queue, discarding any pair left from the last measurement"""
+        try:
+            self.frame_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.capture_enabled.set()
+        
+    def stop_capture(self):
+        """Stop capturing as soon as a measurement no longer needs frames"""
+        self.capture_enabled.clear()
+        
+    def detect_pupil(self, gray_frame: np.ndarray) -> Tuple[Optional[int], Optional[int], Optional[int], Optional[tuple]]:
+        """Detect pupil and remember where it was so the next search can stay near it"""
+        x, y, radius, ellipse = self.detect_pupil_jeo(gray_frame)
+        if x is not None:
+            self.last_pupil_center = (x, y)
+            self.missed_frames = 0
+        else:
+            self.missed_frames += 1
+            if self.missed_frames >= TRACK_MAX_MISSES:
+                self.last_pupil_center = None  # Lost it - go back to a full-frame search
+        return (x, y, radius, ellipse)
+        
+    def detect_pupil_jeo(self, gray_frame: np.ndarray) -> Tuple[Optional[int], Optional[int], Optional[int], Optional[tuple]]:
         """Detect pupil using JEOresearch EyeTracker algorithm with optimized parameters"""
         try:
-            # Crop to aspect ratio (4:3)
-            frame = crop_to_aspect_ratio(frame)
+            # Crop to aspect ratio (4:3); it ends in a resize, which copies the whole
+            # frame even when the camera already delivers 640x480
+            if gray_frame.shape[:2] != (480, 640):
+                gray_frame = crop_to_aspect_ratio(gray_frame)
             
             # Get darkest area with optimized ignore_bounds=60
-            darkest_point = self.get_darkest_area_optimized(frame)
+            darkest_point = self.get_darkest_area_optimized(gray_frame)
             
             if darkest_point is None:
                 return (None, None, None, None)
             
-            # Convert to grayscale
-            gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
             # Get darkest pixel value
             darkest_pixel_value = gray_frame[darkest_point[1], darkest_point[0]]
             
+            # Only the mask square can contribute contours, so threshold, dilate and trace
+            # a crop holding the square plus the dilation's reach instead of the whole frame
+            dx, dy = darkest_point
+            reach = 250 // 2 + 2 * (5 // 2) + 2  # half mask_size + 2 dilations of a 5x5 kernel + slack
+            x0, y0 = max(0, dx - reach), max(0, dy - reach)
+            gray_roi = gray_frame[y0:dy + reach, x0:dx + reach]
+            
             # Apply binary threshold with default added_threshold=15
-            thresholded_image = apply_binary_threshold(gray_frame, darkest_pixel_value, 15)
+            thresholded_image = apply_binary_threshold(gray_roi, darkest_pixel_value, 15)
             
             # Mask outside square with default mask_size=250
-            thresholded_image = mask_outside_square(thresholded_image, darkest_point, 250)
+            thresholded_image = mask_outside_square(thresholded_image, (dx - x0, dy - y0), 250)
             
             # Process with JEOresearch algorithm
-            kernel_size = 5
-            kernel = np.ones((kernel_size, kernel_size), np.uint8)
-            dilated_image = cv2.dilate(thresholded_image, kernel, iterations=2)
+            if self._dilated is None or self._dilated.shape != thresholded_image.shape:
+                self._dilated = np.empty_like(thresholded_image)
+            dilated_image = cv2.dilate(thresholded_image, self._dilate_kernel, dst=self._dilated,
+                                       iterations=2)
             
-            # Find contours
-            contours, _ = cv2.findContours(dilated_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # Find contours (offset back to full-frame coordinates)
+            contours, _ = cv2.findContours(dilated_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                           offset=(x0, y0))
             
             # Filter contours with default parameters
             reduced_contours = filter_contours_by_area_and_return_largest(contours, 1000, 3)
@@ -311,67 +484,72 @@ class SimplePupilMeasurement:
             print(f"Pupil detection error: {e}")
             return (None, None, None, None)
     
-    def get_darkest_area_optimized(self, image):
+    def get_darkest_area_optimized(self, gray):
         """Get darkest area with optimized ignore_bounds=60"""
         ignore_bounds = 60  # Optimized parameter
         image_skip_size = 20
         search_area = 20
         internal_skip_size = 10
         
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        min_sum = float('inf')
-        darkest_point = None
+        x_start, x_stop = ignore_bounds, gray.shape[1] - ignore_bounds
+        y_start, y_stop = ignore_bounds, gray.shape[0] - ignore_bounds
+        if self.last_pupil_center is not None:
+            # Only scan around the last pupil, staying on the full-frame sampling grid
+            cx, cy = self.last_pupil_center
+            x_start += max(0, (cx - TRACK_WINDOW - x_start) // image_skip_size) * image_skip_size
+            y_start += max(0, (cy - TRACK_WINDOW - y_start) // image_skip_size) * image_skip_size
+            x_stop = min(x_stop, cx + TRACK_WINDOW)
+            y_stop = min(y_stop, cy + TRACK_WINDOW)
 
-        for y in range(ignore_bounds, gray.shape[0] - ignore_bounds, image_skip_size):
-            for x in range(ignore_bounds, gray.shape[1] - ignore_bounds, image_skip_size):
-                current_sum = 0
-                num_pixels = 0
-                for dy in range(0, search_area, internal_skip_size):
-                    if y + dy >= gray.shape[0]:
-                        break
-                    for dx in range(0, search_area, internal_skip_size):
-                        if x + dx >= gray.shape[1]:
-                            break
-                        current_sum += gray[y + dy][x + dx]
-                        num_pixels += 1
-
-                if current_sum < min_sum and num_pixels > 0:
-                    min_sum = current_sum
-                    darkest_point = (x + search_area // 2, y + search_area // 2)
-
-        return darkest_point
+        x, y = _darkest_window(gray, x_start, x_stop, y_start, y_stop,
+                               image_skip_size, search_area, internal_skip_size)
+        if x < 0:
+            return None
+        return (x + search_area // 2, y + search_area // 2)
+        
+    def report_frame(self, phase, x, y, radius):
+        """Track the frame rate and print a detection status line at most once a second"""
+        now = time.monotonic()
+        self.frame_times.append(now)
+        if now - self.last_status_time < 1.0:
+            return
+        self.last_status_time = now
+        span = self.frame_times[-1] - self.frame_times[0]
+        fps = (len(self.frame_times) - 1) / span if span > 0 else 0.0
+        if radius is not None:
+            print(f"{phase} - {fps:.1f} fps, detected pupil: position=({x}, {y}), radius={radius}")
+        else:
+            print(f"{phase} - {fps:.1f} fps, no pupil detected")
+        
+    def reset_stability(self):
+        """Forget the recent pupil sizes, e.g. at the start of a measurement phase"""
+        self.last_pupil_sizes.clear()
+        self._size_sum = 0
+        self._size_sumsq = 0
         
     def is_pupil_stable(self, current_radius: float) -> bool:
         """Check if the pupil size is stable over multiple frames - more robust checking"""
-        if not self.last_pupil_sizes:
-            self.last_pupil_sizes.append(current_radius)
-            return False
-        
-        # Add the current radius to the list
+        # Slide the window, keeping running sums so the spread check needs no pass over it
+        if len(self.last_pupil_sizes) == STABLE_FRAMES:
+            oldest = self.last_pupil_sizes[0]
+            self._size_sum -= oldest
+            self._size_sumsq -= oldest * oldest
         self.last_pupil_sizes.append(current_radius)
-        
-        # Keep only the last STABLE_FRAMES elements
-        if len(self.last_pupil_sizes) > STABLE_FRAMES:
-            self.last_pupil_sizes.pop(0)
+        self._size_sum += current_radius
+        self._size_sumsq += current_radius * current_radius
         
         # Need at least STABLE_FRAMES measurements to check stability
         if len(self.last_pupil_sizes) < STABLE_FRAMES:
             return False
         
-        # Check if all recent measurements are within threshold of each other
-        recent_sizes = self.last_pupil_sizes[-STABLE_FRAMES:]
-        min_size = min(recent_sizes)
-        max_size = max(recent_sizes)
-        
         # All measurements should be within STABLE_THRESHOLD of each other
-        if (max_size - min_size) <= STABLE_THRESHOLD:
+        if (max(self.last_pupil_sizes) - min(self.last_pupil_sizes)) <= STABLE_THRESHOLD:
             # Additional check: standard deviation should be low
-            mean_size = sum(recent_sizes) / len(recent_sizes)
-            variance = sum((size - mean_size) ** 2 for size in recent_sizes) / len(recent_sizes)
-            std_dev = variance ** 0.5
+            mean_size = self._size_sum / STABLE_FRAMES
+            variance = self._size_sumsq / STABLE_FRAMES - mean_size ** 2
             
             # Standard deviation should be less than 1 pixel for true stability
-            if std_dev < 1.0:
+            if variance < 1.0:
                 return True
         
         return False
@@ -389,38 +567,47 @@ class SimplePupilMeasurement:
                 
                 # Wait for proximity trigger
                 if GPIO.input(PROXIMITY_PIN):  # Active low
+                    self.stop_capture()  # Nothing to measure - let the camera idle
                     self.set_all_color(0, 0, 0)  # LEDs off
                     self.set_ir_led(0)  # IR LED off
                     print("Waiting for object detection...")
-                    time.sleep(0.1)
+                    # Block until the sensor pulls the line low instead of polling; the
+                    # timeout keeps Ctrl+C responsive
+                    GPIO.wait_for_edge(PROXIMITY_PIN, GPIO.FALLING, timeout=1000)
                     continue
                 
                 # Object detected - start recording and measurement
                 print("\n=== OBJECT DETECTED - STARTING MEASUREMENT ===")
                 self.start_recording()
                 self.measurement_data = {}  # Reset measurement data
+                self.last_pupil_center = None  # New subject - search the whole frame
+                self.start_capture()
                 
                 # Phase 1: IR light only, no white light
                 self.current_phase = "Phase 1: IR Only"
                 print("Phase 1: IR light only - measuring baseline pupil size...")
                 self.set_all_color(0, 0, 0)  # No white light
                 self.set_ir_led(25)  # 75% IR LED brightness only
-                self.last_pupil_sizes = []  # Reset stability tracking
+                self.reset_stability()  # Reset stability tracking
                 
                 measurement_start = time.time()
                 first_radius = None
                 
                 while time.time() - measurement_start < 10:  # Timeout after 10 seconds
-                    frame = self.camera.capture_array()
-                    x, y, radius, ellipse = self.detect_pupil(frame)
+                    try:
+                        frame, gray_frame = self.frame_queue.get(timeout=1.0)
+                    except queue.Empty:
+                        print("No camera frame received - retrying")
+                        continue  # The phase timeout still applies
+                    x, y, radius, ellipse = self.detect_pupil(gray_frame)
                     
                     # Always save frame with overlay (regardless of recording setting)
                     overlay_frame = self.add_debug_overlay(frame, x, y, radius, ellipse)
                     self.write_frame_to_video(overlay_frame)
                     
+                    self.report_frame("Phase 1", x, y, radius)
+                    
                     if radius is not None:
-                        print(f"Phase 1 - Detected pupil: position=({x}, {y}), radius={radius}")
-                        
                         if self.is_pupil_stable(radius):
                             first_radius = radius
                             self.measurement_data['baseline_radius'] = first_radius
@@ -432,11 +619,10 @@ class SimplePupilMeasurement:
                             self.set_all_color(0, 0, 0)  # Back to no white light
                             time.sleep(0.5)
                             break
-                    
-                    time.sleep(0.1)
                 
                 if first_radius is None:
                     print("✗ Phase 1 failed - no stable pupil detected with IR only")
+                    self.stop_capture()
                     self.set_ir_led(0)  # Turn off IR
                     self.stop_recording()
                     continue
@@ -446,7 +632,7 @@ class SimplePupilMeasurement:
                 print("Phase 2: Measuring pupil response to 15% white light...")
                 self.set_all_color(255, 255, 255, 15)  # 15% white light
                 # Keep IR LED at 75%
-                self.last_pupil_sizes = []  # Reset stability tracking
+                self.reset_stability()  # Reset stability tracking
                 
                 # Wait a moment for pupil to adjust
                 time.sleep(1)
@@ -455,23 +641,27 @@ class SimplePupilMeasurement:
                 second_radius = None
                 
                 while time.time() - second_measurement_start < 10:  # 10 second timeout
-                    frame = self.camera.capture_array()
-                    new_x, new_y, new_radius, new_ellipse = self.detect_pupil(frame)
+                    try:
+                        frame, gray_frame = self.frame_queue.get(timeout=1.0)
+                    except queue.Empty:
+                        print("No camera frame received - retrying")
+                        continue  # The phase timeout still applies
+                    new_x, new_y, new_radius, new_ellipse = self.detect_pupil(gray_frame)
                     
                     # Always save frame with overlay (regardless of recording setting)
                     overlay_frame = self.add_debug_overlay(frame, new_x, new_y, new_radius, new_ellipse)
                     self.write_frame_to_video(overlay_frame)
                     
+                    self.report_frame("Phase 2", new_x, new_y, new_radius)
+                    
                     if new_radius is not None:
-                        print(f"Phase 2 - Detected pupil: position=({new_x}, {new_y}), radius={new_radius}")
-                        
                         if self.is_pupil_stable(new_radius):
                             second_radius = new_radius
                             self.measurement_data['response_radius'] = second_radius
                             print(f"✓ PHASE 2 MEASUREMENT STABLE: {second_radius} pixels (with 15% white)")
                             break
-                    
-                    time.sleep(0.1)
+                
+                self.stop_capture()  # Both measurements taken or given up; no more frames needed
                 
                 if second_radius is None:
                     print("✗ Phase 3 failed - no stable pupil detected with white light")
@@ -525,6 +715,11 @@ class SimplePupilMeasurement:
         """Clean up resources"""
         print("Cleaning up...")
         self.stop_recording()
+        
+        # Stop the capture thread before the camera so it isn't left inside capture_request()
+        self.capture_enabled.clear()
+        self.capture_running = False
+        self.capture_thread.join(timeout=2.0)
         self.camera.stop()
         
         if self.gpio_initialized:
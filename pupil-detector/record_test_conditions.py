@@ -2,6 +2,8 @@
 
 import os
 import time
+import threading
+import queue
 import numpy as np
 import cv2
 from picamera2 import Picamera2
@@ -9,6 +11,14 @@ import RPi.GPIO as GPIO
 from rpi_ws281x import PixelStrip, Color
 from datetime import datetime
 
+# libjpeg-turbo (NEON) encoder when PyTurboJPEG and its library are installed;
+# otherwise frames are written with cv2.imwrite
+try:
+    from turbojpeg import TurboJPEG
+    turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    turbo_jpeg = None
+
 # Fix display environment for Pi
 os.environ.pop('DISPLAY', None)  # Remove any SSH forwarded display
 os.environ.pop('SSH_CLIENT', None)  # Remove SSH indicators
@@ -29,6 +39,7 @@ IR_LED_FREQ = 100   # PWM frequency for IR LED
 
 PHASE_1_DURATION = 5  # Phase 1 (IR only) duration in seconds
 PHASE_2_DURATION = 5  # Phase 2 (IR + light) duration in seconds
+RECORD_FPS = 10       # Capture rate during the recording phases
 
 class TestConditionRecorder:
     def __init__(self, show_preview=True):
@@ -41,6 +52,11 @@ class TestConditionRecorder:
         self.current_ir_duty = 0  # Track current IR LED duty cycle
         self.gpio_initialized = False  # Track GPIO initialization
         
+        # JPEG encoding and disk writes happen on a writer thread so they don't
+        # hold up capture; the bounded queue applies backpressure if disk stalls
+        self.write_queue = queue.Queue(maxsize=8)
+        threading.Thread(target=self.frame_writer, daemon=True).start()
+        
         self.setup_camera()
         self.setup_gpio()
         
@@ -49,8 +65,12 @@ class TestConditionRecorder:
         print("Setting up camera...")
         self.camera = Picamera2()
         
-        # Use simple configuration for recording
-        preview_config = self.camera.create_preview_configuration(main={"size": (640, 480)})
+        # Use simple configuration for recording. "RGB888" is stored as [B, G, R],
+        # so frames go straight to cv2.imwrite without an alpha/channel conversion.
+        # Two buffers instead of the preview default of four keeps captured frames
+        # fresh; one buffer would stall the sensor while the preview holds it.
+        preview_config = self.camera.create_preview_configuration(
+            main={"size": (640, 480), "format": "RGB888"}, buffer_count=2)
         self.camera.configure(preview_config)
         
         # Start with or without preview
@@ -80,6 +100,7 @@ class TestConditionRecorder:
             # Setup LEDs
             self.strip = PixelStrip(LED_COUNT, LED_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, LED_CHANNEL)
             self.strip.begin()
+            self.strip_color = None  # Color currently held in the strip's pixel buffer
             self.set_all_color(0, 0, 0)  # Start with LEDs off
             self.gpio_initialized = True
             print("GPIO setup complete")
@@ -109,6 +130,7 @@ class TestConditionRecorder:
             return
             
         self.recording = False
+        self.write_queue.join()  # Make sure every frame is on disk before ffmpeg runs
         print(f"Converting {self.frame_count} frames to video...")
         
         try:
@@ -116,7 +138,7 @@ class TestConditionRecorder:
             import subprocess
             cmd = [
                 'ffmpeg', '-y',  # -y to overwrite existing files
-                '-framerate', '10',  # 10 FPS
+                '-framerate', str(RECORD_FPS),
                 '-i', f'{self.recording_dir}/frame_%06d.jpg',  # Input pattern
                 '-c:v', 'libx264',  # H.264 codec
                 '-pix_fmt', 'yuv420p',  # Pixel format for compatibility
@@ -145,13 +167,28 @@ class TestConditionRecorder:
         if self.recording:
             # Save clean frame without overlays for better analysis
             frame_filename = f"{self.recording_dir}/frame_{self.frame_count:06d}.jpg"
-            cv2.imwrite(frame_filename, frame)
+            self.write_queue.put((frame_filename, frame))
             self.frame_count += 1
             
             # Print progress every 25 frames
             if self.frame_count % 25 == 0:
                 print(f"Recorded {self.frame_count} frames... Phase: {self.current_phase}")
                 
+    def frame_writer(self):
+        """Writer thread: encode and save frames queued by write_frame"""
+        while True:
+            frame_filename, frame = self.write_queue.get()
+            try:
+                if turbo_jpeg is not None:
+                    with open(frame_filename, 'wb') as f:
+                        f.write(turbo_jpeg.encode(frame, quality=95))  # Same quality as imwrite
+                else:
+                    cv2.imwrite(frame_filename, frame)
+            except Exception as e:
+                print(f"Error writing {frame_filename}: {e}")
+            finally:
+                self.write_queue.task_done()
+                
     def add_info_overlay(self, frame):
         """Add information overlay to frame"""
         overlay_frame = frame.copy()
@@ -191,9 +228,10 @@ class TestConditionRecorder:
         if self.gpio_initialized:
             brightness = int((brightness_percent / 100.0) * 255)
             color = Color(red, green, blue)
-            for i in range(LED_COUNT):
-                self.strip.setPixelColor(i, color)
-                self.strip.setBrightness(brightness)
+            self.strip.setBrightness(brightness)  # Global setting, once per update
+            if color != self.strip_color:  # Brightness-only changes keep the pixels as they are
+                self.strip[:] = color  # No Python loop here; rpi_ws281x still sets each pixel internally
+                self.strip_color = color
             self.strip.show()
         
     def set_ir_led(self, duty_cycle: float):
@@ -213,6 +251,20 @@ class TestConditionRecorder:
                 self.set_all_color(0, 0, 0)  # Off
                 time.sleep(0.3)
 
+    def record_phase(self, duration: float):
+        """Capture and save frames at RECORD_FPS for the given number of seconds"""
+        frame_interval = 1.0 / RECORD_FPS
+        phase_start = time.monotonic()
+        next_frame = phase_start
+        while time.monotonic() - phase_start < duration:
+            frame = self.camera.capture_array()
+            self.write_frame(frame)
+            
+            # Sleep until the next slot on a fixed schedule, so capture and queueing
+            # time doesn't stretch the frame interval
+            next_frame += frame_interval
+            time.sleep(max(0.0, next_frame - time.monotonic()))
+            
     def run_test_recording(self):
         """Run the test condition recording sequence"""
         print("Test Condition Recorder")
@@ -230,7 +282,9 @@ class TestConditionRecorder:
                 if GPIO.input(PROXIMITY_PIN):  # Active low - no object
                     self.set_all_color(0, 0, 0)  # LEDs off
                     self.set_ir_led(0)  # IR LED off
-                    time.sleep(0.1)
+                    # Block until the sensor pulls the line low instead of polling; the
+                    # timeout keeps Ctrl+C responsive
+                    GPIO.wait_for_edge(PROXIMITY_PIN, GPIO.FALLING, timeout=1000)
                     continue
                 
                 # Object detected - start recording sequence
@@ -243,11 +297,7 @@ class TestConditionRecorder:
                 self.set_all_color(0, 0, 0)  # No white light
                 self.set_ir_led(50)  # 50% IR LED brightness
                 
-                phase1_start = time.time()
-                while time.time() - phase1_start < PHASE_1_DURATION:
-                    frame = self.camera.capture_array()
-                    self.write_frame(frame)
-                    time.sleep(0.1)  # 10 FPS
+                self.record_phase(PHASE_1_DURATION)
                 
                 print("Phase 1 complete")
                 
@@ -257,11 +307,7 @@ class TestConditionRecorder:
                 self.set_all_color(255, 255, 255, 5)  # 5% white light
                 # Keep IR LED at 50%
                 
-                phase2_start = time.time()
-                while time.time() - phase2_start < PHASE_2_DURATION:
-                    frame = self.camera.capture_array()
-                    self.write_frame(frame)
-                    time.sleep(0.1)  # 10 FPS
+                self.record_phase(PHASE_2_DURATION)
                 
                 print("Phase 2 complete")
                 
@@ -279,7 +325,7 @@ class TestConditionRecorder:
                 
                 # Wait for object to be removed
                 while not GPIO.input(PROXIMITY_PIN):  # Wait for no object
-                    time.sleep(0.1)
+                    GPIO.wait_for_edge(PROXIMITY_PIN, GPIO.RISING, timeout=1000)
                 
                 print("Object removed - ready for next recording")
                 time.sleep(1)  # Brief pause before next recording
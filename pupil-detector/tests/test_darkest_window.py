@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Check that the numba and NumPy darkest-area scans of the measurement scripts agree
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Import the measurement scripts from the parent directory
+PUPIL_DETECTOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PUPIL_DETECTOR_DIR)
+sys.path.insert(0, os.path.join(PUPIL_DETECTOR_DIR, 'EyeTracker'))
+
+# (x_start, x_stop, y_start, y_stop, step, search_area, internal_step)
+SCANS = [
+    (60, 580, 60, 420, 20, 20, 10),   # Full-frame scan used by get_darkest_area_optimized
+    (160, 360, 100, 300, 20, 20, 10),  # Tracking window around a previous pupil
+    (600, 640, 440, 480, 20, 60, 10),  # Windows running past the frame edge
+    (300, 300, 60, 420, 20, 20, 10),   # Empty range
+]
+
+
+def load_measurement(module_name):
+    """Import a measurement script, skipping the test off the Pi"""
+    for dependency in ('picamera2', 'RPi.GPIO', 'rpi_ws281x', 'OrloskyPupilDetectorRaspberryPi'):
+        pytest.importorskip(dependency)
+    return pytest.importorskip(module_name)
+
+
+def scan_variants(module):
+    """Return the scan implementations to compare against the NumPy version"""
+    variants = {
+        # numba sums in int64; give the uncompiled loop int64 pixels to match
+        'loop': lambda gray, *scan: module._darkest_window_loop(gray.astype(np.int64), *scan),
+    }
+    if module.njit is not None:
+        variants['numba'] = module._darkest_window
+    return variants
+
+
+@pytest.mark.parametrize('module_name', ['pupil_measurement', 'pupil_measurement_headless'])
+def test_darkest_window_variants_agree(module_name):
+    """Test that every darkest-area scan finds the same window as the NumPy scan"""
+    module = load_measurement(module_name)
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (480, 640), dtype=np.uint8) for _ in range(3)]
+    frames.append(np.full((480, 640), 255, dtype=np.uint8))  # Large sums, all equal
+    
+    for name, darkest_window in scan_variants(module).items():
+        for gray in frames:
+            for scan in SCANS:
+                expected = module._darkest_window_numpy(gray, *scan)
+                assert darkest_window(gray, *scan) == expected, (name, scan)
+
+
+@pytest.mark.parametrize('module_name', ['pupil_measurement', 'pupil_measurement_headless'])
+def test_darkest_window_finds_dark_patch(module_name):
+    """Test that the scan lands on a dark patch and keeps the first of equal windows"""
+    module = load_measurement(module_name)
+    gray = np.full((480, 640), 200, dtype=np.uint8)
+    gray[240:260, 300:320] = 10
+    scan = SCANS[0]
+    
+    assert module._darkest_window_numpy(gray, *scan) == (300, 240)
+    assert module._darkest_window_numpy(np.zeros_like(gray), *scan) == (60, 60)
+    for name, darkest_window in scan_variants(module).items():
+        assert darkest_window(gray, *scan) == (300, 240), name
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Check the shared detection-result container used by the tuners
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+# Import the shared module from the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detections import DetectionArrays
+
+
+@dataclass
+class Candidates(DetectionArrays):
+    """Minimal detection result: an id to follow each entry, and its score"""
+    label: np.ndarray
+    total: np.ndarray
+
+
+def test_sorted_by_score_is_stable():
+    """Test that equal scores keep their detection order"""
+    candidates = Candidates(label=np.arange(6),
+                            total=np.array([0.5, 0.9, 0.5, 0.9, 0.1, 0.5]))
+    
+    ordered = candidates.sorted_by_score()
+    
+    assert ordered.label.tolist() == [1, 3, 0, 2, 5, 4]
+    assert ordered.total.tolist() == [0.9, 0.9, 0.5, 0.5, 0.5, 0.1]
+
+
+def test_sorted_by_score_returns_new_subclass_instance():
+    """Test that sorting returns the subclass and leaves the original untouched"""
+    candidates = Candidates(label=np.arange(3), total=np.array([0.1, 0.3, 0.2]))
+    
+    ordered = candidates.sorted_by_score()
+    
+    assert type(ordered) is Candidates
+    assert len(ordered) == 3
+    assert candidates.label.tolist() == [0, 1, 2]
+
+
+def test_sorted_by_score_empty():
+    """Test that an empty result sorts to an empty result"""
+    candidates = Candidates(label=np.array([], dtype=int), total=np.array([]))
+    
+    assert len(candidates.sorted_by_score()) == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
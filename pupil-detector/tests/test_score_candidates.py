@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Check that the numba and NumPy candidate scoring of the simple tuner agree
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Import the tuner from the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tune_simple_detection = pytest.importorskip('tune_simple_detection')
+
+
+def make_candidates(count, seed=0):
+    """Random fitted-blob measurements in full-frame units"""
+    rng = np.random.default_rng(seed)
+    xs = rng.uniform(0, 640, count)
+    ys = rng.uniform(0, 480, count)
+    areas = rng.uniform(400, 108900, count)
+    circularities = rng.uniform(0, 1, count)
+    return xs, ys, areas, circularities
+
+
+def score_variants():
+    """Return the scoring implementations to compare against the NumPy version"""
+    variants = {'loop': tune_simple_detection._score_candidates_loop}
+    if tune_simple_detection.njit is not None:
+        variants['numba'] = tune_simple_detection._score_candidates
+    return variants
+
+
+@pytest.mark.parametrize('count', [0, 1, 7, 200])
+def test_score_candidates_variants_agree(count):
+    """Test that every scoring implementation matches the NumPy scores"""
+    args = make_candidates(count) + (320, 240, 240.0, 0.5, 0.3, 0.2)
+    expected = tune_simple_detection._score_candidates_numpy(*args)
+    
+    for name, score_candidates in score_variants().items():
+        result = score_candidates(*args)
+        assert len(result) == len(expected), name
+        for got, want in zip(result, expected):
+            assert got.shape == (count,), name
+            np.testing.assert_allclose(got, want, rtol=1e-12, atol=1e-12, err_msg=name)
+
+
+def test_score_candidates_values():
+    """Test the scores of a centred, medium-sized, perfectly round blob"""
+    args = (np.array([320.0]), np.array([240.0]), np.array([10000.0]), np.array([1.0]),
+            320, 240, 240.0, 0.5, 0.3, 0.2)
+    distances, center_scores, size_scores, total_scores = \
+        tune_simple_detection._score_candidates_numpy(*args)
+    
+    assert distances[0] == 0.0
+    assert center_scores[0] == 1.0
+    assert size_scores[0] == 1.0
+    assert total_scores[0] == pytest.approx(1.0)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
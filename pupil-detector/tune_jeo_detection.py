@@ -8,8 +8,35 @@ from typing import Tuple, Optional, List
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import time
+import threading
+from dataclasses import dataclass, fields
+
+from detections import DetectionArrays
+
+# Half-resolution preview only: heuristic threshold adjustments, tunable, that keep
+# the preview roughly in line with full resolution. Sliders, Auto Param2 and
+# exported values always use full-resolution semantics
+HALF_RES_CANNY_GAIN = 2.0
+HALF_RES_PARAM2_DIVISOR = 1.25
+
+
+@dataclass
+class Detections(DetectionArrays):
+    """Detected pupil circles stored as parallel arrays, one entry per circle"""
+    x: np.ndarray
+    y: np.ndarray
+    r: np.ndarray
+    darkness: np.ndarray
+    center: np.ndarray
+    size: np.ndarray
+    total: np.ndarray
+    distance: np.ndarray
 
 class JEOPupilDetectionTuner:
+    # Slider parameters stored as integers; the rest stay floats
+    INT_PARAMS = frozenset(('gaussian_blur', 'min_radius', 'max_radius', 'dp', 'min_dist',
+                            'param1', 'param2'))
+    
     def __init__(self, root):
         self.root = root
         self.root.title("JEO EyeTracker Tuner")
@@ -37,9 +64,18 @@ class JEOPupilDetectionTuner:
         self.current_recording_idx = 0
         self.current_frame_idx = 0
         self.frames = []
+        self.frame_images = []  # Decoded frames, filled by a background thread per recording
         self.playing = False
         self.play_speed = 100  # ms between frames
+        self._next_deadline = 0.0  # monotonic time the next played frame is due
         self.current_frame = None
+        self._render_key = None  # (frame path, preview mode, params) that current_frame was drawn for
+        self.half_res_preview = False  # Approximate half-resolution Hough for faster scrubbing
+        self._center_mask = None  # Center search-circle mask, rebuilt only when the frame size changes
+        
+        # Run blur, downscale and Canny through OpenCL (T-API) when the platform offers it
+        self.use_opencl = cv2.ocl.haveOpenCL()
+        cv2.ocl.setUseOpenCL(self.use_opencl)
         
         self.setup_ui()
         self.load_recordings()
@@ -92,6 +128,11 @@ class JEOPupilDetectionTuner:
         ttk.Scale(parent, from_=50, to=500, variable=self.speed_var, 
                  orient=tk.HORIZONTAL, command=self.on_speed_changed).pack(fill=tk.X, pady=(0, 10))
         
+        # Faster, approximate detection; sliders and exported values keep full-resolution meaning
+        self.half_res_var = tk.BooleanVar(value=self.half_res_preview)
+        ttk.Checkbutton(parent, text="Fast half-resolution preview", variable=self.half_res_var,
+                        command=self.on_preview_mode_changed).pack(pady=(0, 10))
+        
         # Detection parameters in a grid
         ttk.Label(parent, text="JEO Detection Parameters", font=('Arial', 12, 'bold')).pack(pady=(10, 5))
         
@@ -100,6 +141,7 @@ class JEOPupilDetectionTuner:
         
         # Create sliders for each parameter in a grid
         self.param_vars = {}
+        self.param_ranges = {}  # param -> (min, max) of its slider
         param_configs = [
             ('gaussian_blur', 'Gaussian Blur', 3, 15, 2),
             ('canny_low', 'Canny Low', 10, 100, 5),
@@ -118,6 +160,7 @@ class JEOPupilDetectionTuner:
         
         # Create parameters in 3 columns
         for i, (param, label, min_val, max_val, step) in enumerate(param_configs):
+            self.param_ranges[param] = (min_val, max_val)
             row = i // 3
             col = i % 3
             self.create_parameter_slider(params_frame, param, label, min_val, max_val, step, row, col)
@@ -133,6 +176,7 @@ class JEOPupilDetectionTuner:
         self.info_text.pack(fill=tk.X, pady=10)
         
         # Export button
+        ttk.Button(parent, text="Auto Param2", command=self.auto_tune_param2).pack(pady=(10, 0))
         ttk.Button(parent, text="Export Parameters", command=self.export_parameters).pack(pady=10)
         
     def create_parameter_slider(self, parent, param, label, min_val, max_val, step, row, col):
@@ -212,6 +256,11 @@ class JEOPupilDetectionTuner:
             
         recording = self.recordings[self.current_recording_idx]
         self.frames = recording['frames']
+        self.frame_images = [None] * len(self.frames)
+        
+        # Decode the recording in the background so playback doesn't wait on imread
+        threading.Thread(target=self._prefetch_frames,
+                         args=(self.frames, self.frame_images), daemon=True).start()
         
         # Update frame scale
         self.frame_scale.configure(to=len(self.frames) - 1)
@@ -245,9 +294,15 @@ class JEOPupilDetectionTuner:
         """Handle play speed change"""
         self.play_speed = int(float(value))
         
+    def on_preview_mode_changed(self):
+        """Handle the half-resolution preview toggle"""
+        self.half_res_preview = self.half_res_var.get()
+        if not self.playing:
+            self.display_current_frame()
+            
     def on_param_changed(self, param, value):
         """Handle parameter slider change"""
-        if param in ['gaussian_blur', 'min_radius', 'max_radius', 'dp', 'min_dist', 'param1', 'param2']:
+        if param in self.INT_PARAMS:
             # Ensure integer values for these parameters
             self.params[param] = int(float(value))
         else:
@@ -262,8 +317,12 @@ class JEOPupilDetectionTuner:
         if not self.playing:
             self.display_current_frame()
             
-    def detect_pupil_jeo(self, frame):
+    def detect_pupil_jeo(self, frame, half_res=None):
         """JEOresearch EyeTracker-inspired pupil detection"""
+        if half_res is None:
+            half_res = self.half_res_preview
+        scale = 2 if half_res else 1
+        
         # Convert to grayscale
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
@@ -271,45 +330,53 @@ class JEOPupilDetectionTuner:
         kernel_size = int(self.params['gaussian_blur'])
         if kernel_size % 2 == 0:
             kernel_size += 1
-        blurred = cv2.GaussianBlur(gray, (kernel_size, kernel_size), 0)
+        # With OpenCL the images up to the edge map are UMats and stay on the device;
+        # gray itself stays on the host for the darkness checks below
+        blurred = cv2.GaussianBlur(cv2.UMat(gray) if self.use_opencl else gray,
+                                   (kernel_size, kernel_size), 0)
         
-        # Create center mask
+        # Create center mask (it depends only on the frame size)
         height, width = gray.shape
         center_x, center_y = width // 2, height // 2
-        mask = np.zeros((height, width), dtype=np.uint8)
-        cv2.circle(mask, (center_x, center_y), min(width, height) // 3, 255, -1)
+        if self._center_mask is None or self._center_mask.shape != gray.shape:
+            self._center_mask = np.zeros((height, width), dtype=np.uint8)
+            cv2.circle(self._center_mask, (center_x, center_y), min(width, height) // 3, 255, -1)
+        mask = cv2.UMat(self._center_mask) if self.use_opencl else self._center_mask
         
         # Apply mask
         masked = cv2.bitwise_and(blurred, mask)
         
-        # Canny edge detection
+        # The preview runs edges and Hough on a half-resolution copy (Hough cost grows
+        # with pixels x radii); circles are scaled back below
+        if scale > 1:
+            masked = cv2.resize(masked, (width // scale, height // scale), interpolation=cv2.INTER_AREA)
+        
+        # Canny edge detection; downscaling steepens edges, so the preview raises the
+        # thresholds to keep a similar edge density
+        canny_gain = HALF_RES_CANNY_GAIN if half_res else 1
         edges = cv2.Canny(masked, 
-                         self.params['canny_low'], 
-                         self.params['canny_high'])
+                         self.params['canny_low'] * canny_gain, 
+                         self.params['canny_high'] * canny_gain)
+        
+        # HoughCircles has no OpenCL kernel; hand it a host array
+        if self.use_opencl:
+            edges = edges.get()
         
         # HoughCircles detection
-        circles = cv2.HoughCircles(
-            edges,
-            cv2.HOUGH_GRADIENT,
-            dp=self.params['dp'],
-            minDist=int(self.params['min_dist']),
-            param1=int(self.params['param1']),
-            param2=int(self.params['param2']),
-            minRadius=int(self.params['min_radius']),
-            maxRadius=int(self.params['max_radius'])
-        )
+        circles = self.find_circles(edges, int(self.params['param2']), half_res)
         
-        detected_pupils = []
+        # Candidate attributes collected column-wise (see Detections)
+        columns = {f.name: [] for f in fields(Detections)}
         
         if circles is not None:
-            circles = np.round(circles[0, :]).astype("int")
+            circles = np.round(circles[0, :] * scale).astype("int")
             
             for (x, y, r) in circles:
                 if x - r > 0 and x + r < width and y - r > 0 and y + r < height:
                     # Check darkness of the region
                     roi = gray[y-r:y+r, x-r:x+r]
                     if roi.size > 0:
-                        mean_intensity = np.mean(roi)
+                        mean_intensity = cv2.mean(roi)[0]  # Single SIMD pass over the uint8 ROI
                         darkness_score = 1.0 - (mean_intensity / 255.0)
                         
                         # Calculate distance from center
@@ -326,28 +393,93 @@ class JEOPupilDetectionTuner:
                         
                         # Only include if dark enough
                         if darkness_score > self.params['darkness_threshold']:
-                            detected_pupils.append({
-                                'x': x, 'y': y, 'r': r,
-                                'darkness': darkness_score,
-                                'center_score': center_score,
-                                'size_score': size_score,
-                                'total_score': total_score,
-                                'distance': distance_from_center
-                            })
+                            columns['x'].append(x)
+                            columns['y'].append(y)
+                            columns['r'].append(r)
+                            columns['darkness'].append(darkness_score)
+                            columns['center'].append(center_score)
+                            columns['size'].append(size_score)
+                            columns['total'].append(total_score)
+                            columns['distance'].append(distance_from_center)
+        
+        detections = Detections(
+            x=np.array(columns['x'], dtype=np.int32),
+            y=np.array(columns['y'], dtype=np.int32),
+            r=np.array(columns['r'], dtype=np.int32),
+            **{name: np.array(values, dtype=np.float64)
+               for name, values in columns.items() if name not in ('x', 'y', 'r')}
+        )
         
         # Sort by total score
-        detected_pupils.sort(key=lambda p: p['total_score'], reverse=True)
+        return detections.sorted_by_score(), edges
+        
+    def find_circles(self, edges, param2, half_res=False):
+        """Run HoughCircles on an edge map, given full-resolution parameters"""
+        # On the half-resolution preview distances and radii halve; the vote threshold
+        # only drops slightly (heuristic, see HALF_RES_PARAM2_DIVISOR)
+        scale = 2 if half_res else 1
+        if half_res:
+            param2 = max(1, round(param2 / HALF_RES_PARAM2_DIVISOR))
+        return cv2.HoughCircles(
+            edges,
+            cv2.HOUGH_GRADIENT,
+            dp=self.params['dp'],
+            minDist=max(1, int(self.params['min_dist']) // scale),
+            param1=int(self.params['param1']),
+            param2=param2,
+            minRadius=int(self.params['min_radius']) // scale,
+            maxRadius=max(1, int(self.params['max_radius']) // scale)
+        )
         
-        return detected_pupils, edges
+    def auto_tune_param2(self):
+        """Bisect param2 so HoughCircles finds a single circle on the current frame"""
+        frame = self.get_frame(self.current_frame_idx) if self.frames else None
+        if frame is None:
+            return
+        _, edges = self.detect_pupil_jeo(frame, half_res=False)  # Tune with full-resolution meaning
+        
+        def count(param2):
+            circles = self.find_circles(edges, param2)
+            return 0 if circles is None else circles.shape[1]
+        
+        # Fewer circles pass a higher accumulator threshold; find the lowest
+        # param2 (within the slider range) that leaves at most one
+        lo, hi = self.param_ranges['param2']
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if count(mid) <= 1:
+                hi = mid
+            else:
+                lo = mid + 1
+        
+        # No value yields exactly one circle, e.g. several circles drop to none at
+        # once; leave param2 unchanged rather than pick a misleading value
+        found = count(lo)
+        if found != 1:
+            messagebox.showinfo("Auto Param2",
+                                f"No Param2 in the slider range finds exactly one circle "
+                                f"on this frame ({found} at Param2={lo}); value left unchanged")
+            return
+        
+        self.param_vars['param2'].set(lo)
+        self.on_param_changed('param2', lo)
         
     def display_current_frame(self):
         """Display current frame with detection overlay"""
         if not self.frames or self.current_frame_idx >= len(self.frames):
             return
             
-        # Load frame
+        # Same frame with the same parameters draws the same result, e.g. while
+        # an integer slider is dragged within one step; just re-show it
         frame_path = self.frames[self.current_frame_idx]
-        frame = cv2.imread(frame_path)
+        render_key = (frame_path, self.half_res_preview, tuple(self.params.values()))
+        if render_key == self._render_key and self.current_frame is not None:
+            cv2.imshow("JEO Pupil Detection", self.current_frame)
+            cv2.waitKey(1)
+            return
+            
+        # Load frame
+        frame = self.get_frame(self.current_frame_idx)
         if frame is None:
             return
             
@@ -362,16 +494,17 @@ class JEOPupilDetectionTuner:
         center_x, center_y = width // 2, height // 2
         
         # Draw detected pupils
-        for i, pupil in enumerate(detected_pupils):
+        for i in range(len(detected_pupils)):
             color = (0, 255, 0) if i == 0 else (0, 255, 255)  # Best in green, others in yellow
+            x, y, r = int(detected_pupils.x[i]), int(detected_pupils.y[i]), int(detected_pupils.r[i])
             
             # Draw circle
-            cv2.circle(display_frame, (pupil['x'], pupil['y']), pupil['r'], color, 2)
-            cv2.circle(display_frame, (pupil['x'], pupil['y']), 2, color, -1)
+            cv2.circle(display_frame, (x, y), r, color, 2)
+            cv2.circle(display_frame, (x, y), 2, color, -1)
             
             # Add score text
-            cv2.putText(display_frame, f"{pupil['total_score']:.2f}", 
-                       (pupil['x'] + pupil['r'] + 5, pupil['y']),
+            cv2.putText(display_frame, f"{detected_pupils.total[i]:.2f}", 
+                       (x + r + 5, y),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
         
         # Add parameter info overlay
@@ -387,6 +520,7 @@ class JEOPupilDetectionTuner:
         
         # Store current frame
         self.current_frame = display_frame
+        self._render_key = render_key
         
         # Display in OpenCV window
         cv2.imshow("JEO Pupil Detection", display_frame)
@@ -395,25 +529,42 @@ class JEOPupilDetectionTuner:
         # Update info display
         self.update_info_display(detected_pupils, frame_path)
         
+    def get_frame(self, frame_idx):
+        """Return decoded frame, decoding from disk only if the prefetch hasn't reached it"""
+        frame = self.frame_images[frame_idx]
+        if frame is None:
+            frame = cv2.imread(self.frames[frame_idx])
+            self.frame_images[frame_idx] = frame
+        return frame
+        
+    def _prefetch_frames(self, frames, images):
+        """Background thread: decode every frame of a recording into images"""
+        for i, path in enumerate(frames):
+            if self.frame_images is not images:
+                return  # Another recording was selected
+            if images[i] is None:
+                images[i] = cv2.imread(path)
+                
     def update_info_display(self, detected_pupils, frame_path):
         """Update information display"""
         info = f"Frame: {self.current_frame_idx + 1}/{len(self.frames)}\n"
         info += f"File: {os.path.basename(frame_path)}\n"
         info += f"Detected pupils: {len(detected_pupils)}\n"
         
-        if detected_pupils:
-            best = detected_pupils[0]
-            info += f"Best: ({best['x']}, {best['y']}) R={best['r']} Score={best['total_score']:.3f}"
+        if len(detected_pupils):
+            d = detected_pupils
+            info += f"Best: ({d.x[0]}, {d.y[0]}) R={d.r[0]} Score={d.total[0]:.3f}"
         
         self.info_text.delete(1.0, tk.END)
         self.info_text.insert(1.0, info)
         
         # Update results
         results = "Detection Results:\n"
-        for i, pupil in enumerate(detected_pupils[:3]):  # Show top 3
-            results += f"{i+1}. Pos:({pupil['x']},{pupil['y']}) R:{pupil['r']} "
-            results += f"Dark:{pupil['darkness']:.3f} "
-            results += f"Score:{pupil['total_score']:.3f}\n"
+        d = detected_pupils
+        for i in range(min(3, len(d))):  # Show top 3
+            results += f"{i+1}. Pos:({d.x[i]},{d.y[i]}) R:{d.r[i]} "
+            results += f"Dark:{d.darkness[i]:.3f} "
+            results += f"Score:{d.total[i]:.3f}\n"
         
         self.results_text.delete(1.0, tk.END)
         self.results_text.insert(1.0, results)
@@ -424,24 +575,31 @@ class JEOPupilDetectionTuner:
         self.play_button.config(text="Pause" if self.playing else "Play")
         
         if self.playing:
+            self._next_deadline = time.monotonic()
             self.play_frames()
             
     def play_frames(self):
-        """Play frames automatically"""
+        """Play frames automatically at a fixed rate, dropping frames when behind"""
         if not self.playing:
             return
             
         self.display_current_frame()
         
-        # Advance frame
-        self.current_frame_idx += 1
+        # Advance frame, skipping frames whose deadline has already passed
+        dt = self.play_speed / 1000.0
+        behind = time.monotonic() - self._next_deadline
+        step = max(1, int(behind / dt) + 1)
+        self._next_deadline += step * dt
+        
+        self.current_frame_idx += step
         if self.current_frame_idx >= len(self.frames):
             self.current_frame_idx = 0
             
         self.frame_var.set(self.current_frame_idx)
         
-        # Schedule next frame
-        self.root.after(self.play_speed, self.play_frames)
+        # Schedule next frame against the deadline instead of a fixed delay
+        delay_ms = max(1, int((self._next_deadline - time.monotonic()) * 1000))
+        self.root.after(delay_ms, self.play_frames)
         
     def reset_playback(self):
         """Reset playback to beginning"""
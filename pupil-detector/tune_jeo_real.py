@@ -18,6 +18,11 @@ from OrloskyPupilDetectorRaspberryPi import (
 )
 
 class RealJEOPupilDetectionTuner:
+    # Slider parameters stored as integers; the rest stay floats
+    INT_PARAMS = frozenset(('ignore_bounds', 'image_skip_size', 'search_area', 'internal_skip_size',
+                            'added_threshold', 'mask_size', 'pixel_thresh', 'kernel_size',
+                            'dilation_iterations'))
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Real JEO EyeTracker Tuner")
@@ -40,6 +45,10 @@ class RealJEOPupilDetectionTuner:
             'darkness_weight': 0.3      # Weight for darkness
         }
         
+        # Dilation kernel, rebuilt only when the kernel_size slider moves
+        kernel_size = self.params['kernel_size']
+        self._dilate_kernel = np.ones((kernel_size, kernel_size), np.uint8)
+        
         # State variables
         self.recordings = []
         self.current_recording_idx = 0
@@ -47,6 +56,7 @@ class RealJEOPupilDetectionTuner:
         self.frames = []
         self.playing = False
         self.play_speed = 100  # ms between frames
+        self._next_deadline = 0.0  # monotonic time the next played frame is due
         self.current_frame = None
         
         self.setup_ui()
@@ -255,13 +265,16 @@ class RealJEOPupilDetectionTuner:
         
     def on_param_changed(self, param, value):
         """Handle parameter slider change"""
-        if param in ['ignore_bounds', 'image_skip_size', 'search_area', 'internal_skip_size', 
-                    'added_threshold', 'mask_size', 'pixel_thresh', 'kernel_size', 'dilation_iterations']:
+        if param in self.INT_PARAMS:
             # Ensure integer values for these parameters
             self.params[param] = int(float(value))
         else:
             self.params[param] = float(value)
         
+        if param == 'kernel_size':
+            kernel_size = self.params['kernel_size']
+            self._dilate_kernel = np.ones((kernel_size, kernel_size), np.uint8)
+        
         # Update value label
         label = getattr(self, f"{param}_label", None)
         if label:
@@ -276,15 +289,15 @@ class RealJEOPupilDetectionTuner:
         # Crop to aspect ratio
         frame = crop_to_aspect_ratio(frame)
         
+        # Convert to grayscale once; the darkest-area search and threshold share it
+        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        
         # Get darkest area with custom parameters
-        darkest_point = self.get_darkest_area_custom(frame)
+        darkest_point = self.get_darkest_area_custom(gray_frame)
         
         if darkest_point is None:
             return [], None
         
-        # Convert to grayscale
-        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
         # Get darkest pixel value
         darkest_pixel_value = gray_frame[darkest_point[1], darkest_point[0]]
         
@@ -299,14 +312,13 @@ class RealJEOPupilDetectionTuner:
         
         return detected_pupils, thresholded_image
         
-    def get_darkest_area_custom(self, image):
+    def get_darkest_area_custom(self, gray):
         """Custom version of get_darkest_area with adjustable parameters"""
         ignore_bounds = int(self.params['ignore_bounds'])
         image_skip_size = int(self.params['image_skip_size'])
         search_area = int(self.params['search_area'])
         internal_skip_size = int(self.params['internal_skip_size'])
         
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         min_sum = float('inf')
         darkest_point = None
 
@@ -331,15 +343,22 @@ class RealJEOPupilDetectionTuner:
         
     def process_frames_custom(self, thresholded_image, frame, gray_frame, darkest_point):
         """Custom version of process_frames with adjustable parameters"""
-        kernel_size = int(self.params['kernel_size'])
-        kernel = np.ones((kernel_size, kernel_size), np.uint8)
         dilation_iterations = int(self.params['dilation_iterations'])
         
+        # Only the mask square can hold contours, so dilate and trace a crop covering
+        # the square plus the dilation's reach instead of the whole frame
+        dx, dy = darkest_point
+        reach = (int(self.params['mask_size']) // 2
+                 + dilation_iterations * (self._dilate_kernel.shape[0] // 2) + 2)
+        x0, y0 = max(0, dx - reach), max(0, dy - reach)
+        thresh_roi = thresholded_image[y0:dy + reach, x0:dx + reach]
+        
         # Dilate the thresholded image
-        dilated_image = cv2.dilate(thresholded_image, kernel, iterations=dilation_iterations)
+        dilated_image = cv2.dilate(thresh_roi, self._dilate_kernel, iterations=dilation_iterations)
         
-        # Find contours
-        contours, _ = cv2.findContours(dilated_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Find contours (offset back to full-frame coordinates)
+        contours, _ = cv2.findContours(dilated_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                       offset=(x0, y0))
         
         # Filter contours with custom parameters
         pixel_thresh = int(self.params['pixel_thresh'])
@@ -365,10 +384,11 @@ class RealJEOPupilDetectionTuner:
                 area = np.pi * (major_axis / 2) * (minor_axis / 2)
                 size_score = 1.0 - abs(area - 1000) / 1000  # Prefer medium size
                 
-                # Darkness score
-                mask_roi = np.zeros(gray_frame.shape, dtype=np.uint8)
-                cv2.fillPoly(mask_roi, [reduced_contours[0]], 255)
-                mean_intensity = cv2.mean(gray_frame, mask=mask_roi)[0]
+                # Darkness score, masking only the contour's bounding box
+                bx, by, bw, bh = cv2.boundingRect(reduced_contours[0])
+                mask_roi = np.zeros((bh, bw), dtype=np.uint8)
+                cv2.fillPoly(mask_roi, [reduced_contours[0]], 255, offset=(-bx, -by))
+                mean_intensity = cv2.mean(gray_frame[by:by + bh, bx:bx + bw], mask=mask_roi)[0]
                 darkness_score = 1.0 - (mean_intensity / 255.0)
                 
                 # Combined score
@@ -481,24 +501,31 @@ class RealJEOPupilDetectionTuner:
         self.play_button.config(text="Pause" if self.playing else "Play")
         
         if self.playing:
+            self._next_deadline = time.monotonic()
             self.play_frames()
             
     def play_frames(self):
-        """Play frames automatically"""
+        """Play frames automatically at a fixed rate, dropping frames when behind"""
         if not self.playing:
             return
             
         self.display_current_frame()
         
-        # Advance frame
-        self.current_frame_idx += 1
+        # Advance frame, skipping frames whose deadline has already passed
+        dt = self.play_speed / 1000.0
+        behind = time.monotonic() - self._next_deadline
+        step = max(1, int(behind / dt) + 1)
+        self._next_deadline += step * dt
+        
+        self.current_frame_idx += step
         if self.current_frame_idx >= len(self.frames):
             self.current_frame_idx = 0
             
         self.frame_var.set(self.current_frame_idx)
         
-        # Schedule next frame
-        self.root.after(self.play_speed, self.play_frames)
+        # Schedule next frame against the deadline instead of a fixed delay
+        delay_ms = max(1, int((self._next_deadline - time.monotonic()) * 1000))
+        self.root.after(delay_ms, self.play_frames)
         
     def reset_playback(self):
         """Reset playback to beginning"""
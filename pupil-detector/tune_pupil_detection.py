@@ -9,6 +9,25 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
 import time
+from dataclasses import dataclass, fields
+
+from detections import DetectionArrays
+
+
+@dataclass
+class Detections(DetectionArrays):
+    """Detected pupil candidates stored as parallel arrays, one entry per candidate"""
+    x: np.ndarray
+    y: np.ndarray
+    major_axis: np.ndarray
+    minor_axis: np.ndarray
+    angle: np.ndarray
+    area: np.ndarray
+    darkness: np.ndarray
+    circularity: np.ndarray
+    center: np.ndarray
+    total: np.ndarray
+    distance: np.ndarray
 
 class PupilDetectionTuner:
     def __init__(self, root):
@@ -37,6 +56,14 @@ class PupilDetectionTuner:
         self.playing = False
         self.play_speed = 100  # ms between frames
         self.current_frame = None
+        self._next_deadline = 0.0  # monotonic time the next played frame is due
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self._mask_cache = {}   # (crop shape, circle centre, radius) -> search-circle mask
+        self._scratch = {}      # crop shape -> reusable pipeline buffers
+        
+        # Run the filter chain through OpenCL (T-API) when the platform offers it
+        self.use_opencl = cv2.ocl.haveOpenCL()
+        cv2.ocl.setUseOpenCL(self.use_opencl)
         
         self.setup_ui()
         self.load_recordings()
@@ -262,20 +289,37 @@ class PupilDetectionTuner:
         """Detect pupil using contour-based approach with ellipse fitting"""
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
-        # Apply blur with current kernel size
         kernel_size = int(self.params['blur_kernel'])
         if kernel_size % 2 == 0:
             kernel_size += 1
-        gray = cv2.GaussianBlur(gray, (kernel_size, kernel_size), 0)
+        block_size = int(self.params['adaptive_block'])
         
-        # Create center mask
+        # Work on the search circle's bounding box, padded by the blur, threshold and
+        # morphology reach so the result matches processing the whole frame
         height, width = gray.shape
         center_x, center_y = width // 2, height // 2
-        mask = np.zeros(gray.shape, dtype=np.uint8)
-        cv2.circle(mask, (center_x, center_y), min(width, height) // 3, 255, -1)
+        radius = min(width, height) // 3
+        pad = kernel_size // 2 + block_size // 2 + 2
+        x0, y0 = max(0, center_x - radius - pad), max(0, center_y - radius - pad)
+        x1, y1 = min(width, center_x + radius + pad + 1), min(height, center_y + radius + pad + 1)
+        gray = gray[y0:y1, x0:x1]
+        
+        # Create center mask
+        mask = self.get_search_mask(gray.shape, (center_x - x0, center_y - y0), radius)
+        
+        # With OpenCL the images below are UMats and stay on the device until .get();
+        # on the host every stage writes into buffers reused across frames
+        if self.use_opencl:
+            gray, mask = cv2.UMat(gray), cv2.UMat(mask)
+            blurred = masked_gray = thresh = closed = None
+        else:
+            blurred, masked_gray, thresh, closed = self.get_scratch_buffers(gray.shape)
+        
+        # Apply blur with current kernel size
+        gray = cv2.GaussianBlur(gray, (kernel_size, kernel_size), 0, dst=blurred)
         
         # Apply mask
-        masked_gray = cv2.bitwise_and(gray, mask)
+        masked_gray = cv2.bitwise_and(gray, mask, dst=masked_gray)
         
         # Adaptive thresholding for better pupil detection
         thresh = cv2.adaptiveThreshold(
@@ -283,19 +327,25 @@ class PupilDetectionTuner:
             255, 
             cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
             cv2.THRESH_BINARY_INV, 
-            int(self.params['adaptive_block']), 
-            int(self.params['adaptive_c'])
+            block_size, 
+            int(self.params['adaptive_c']),
+            dst=thresh
         )
         
         # Morphological operations to clean up
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-        thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-        thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
+        closed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, self._morph_kernel, dst=closed)
+        thresh = cv2.morphologyEx(closed, cv2.MORPH_OPEN, self._morph_kernel, dst=thresh)
+        
+        # Contours and the per-candidate darkness check need host arrays
+        if self.use_opencl:
+            gray, thresh = gray.get(), thresh.get()
         
-        # Find contours
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Find contours (offset back to full-frame coordinates)
+        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                       offset=(x0, y0))
         
-        detected_pupils = []
+        # Candidate attributes collected column-wise (see Detections)
+        columns = {f.name: [] for f in fields(Detections)}
         
         for contour in contours:
             # Filter by area
@@ -314,10 +364,12 @@ class PupilDetectionTuner:
                         aspect_ratio = major_axis / minor_axis if minor_axis > 0 else 0
                         if 0.5 <= aspect_ratio <= 2.0:  # Allow some ovalness
                             
-                            # Check darkness of the region
-                            mask_roi = np.zeros(gray.shape, dtype=np.uint8)
-                            cv2.fillPoly(mask_roi, [contour], 255)
-                            mean_intensity = cv2.mean(gray, mask=mask_roi)[0]
+                            # Check darkness of the region, masking only the contour's bounding box
+                            bx, by, bw, bh = cv2.boundingRect(contour)
+                            mask_roi = np.zeros((bh, bw), dtype=np.uint8)
+                            cv2.fillPoly(mask_roi, [contour], 255, offset=(-bx, -by))
+                            bx, by = bx - x0, by - y0
+                            mean_intensity = cv2.mean(gray[by:by + bh, bx:bx + bw], mask=mask_roi)[0]
                             
                             # Calculate distance from center
                             distance_from_center = np.sqrt((x - center_x)**2 + (y - center_y)**2)
@@ -334,24 +386,47 @@ class PupilDetectionTuner:
                             
                             # Only include if dark enough
                             if darkness_score > self.params['darkness_threshold']:
-                                detected_pupils.append({
-                                    'x': int(x), 'y': int(y), 
-                                    'major_axis': major_axis, 'minor_axis': minor_axis,
-                                    'angle': angle, 'area': area,
-                                    'darkness': darkness_score,
-                                    'circularity': circularity,
-                                    'center_score': center_score,
-                                    'total_score': total_score,
-                                    'distance': distance_from_center,
-                                    'contour': contour
-                                })
+                                columns['x'].append(int(x))
+                                columns['y'].append(int(y))
+                                columns['major_axis'].append(major_axis)
+                                columns['minor_axis'].append(minor_axis)
+                                columns['angle'].append(angle)
+                                columns['area'].append(area)
+                                columns['darkness'].append(darkness_score)
+                                columns['circularity'].append(circularity)
+                                columns['center'].append(center_score)
+                                columns['total'].append(total_score)
+                                columns['distance'].append(distance_from_center)
                     except:
                         continue  # Skip if ellipse fitting fails
         
-        # Sort by total score
-        detected_pupils.sort(key=lambda p: p['total_score'], reverse=True)
+        detections = Detections(
+            x=np.array(columns['x'], dtype=np.int32),
+            y=np.array(columns['y'], dtype=np.int32),
+            **{name: np.array(values, dtype=np.float64)
+               for name, values in columns.items() if name not in ('x', 'y')}
+        )
         
-        return detected_pupils, thresh
+        # Sort by total score
+        return detections.sorted_by_score(), thresh
+        
+    def get_search_mask(self, shape, center, radius):
+        """Return the filled search-circle mask for a crop, built once per geometry"""
+        key = (shape, center, radius)
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = np.zeros(shape, dtype=np.uint8)
+            cv2.circle(mask, center, radius, 255, -1)
+            self._mask_cache[key] = mask
+        return mask
+        
+    def get_scratch_buffers(self, shape):
+        """Return (blurred, masked, thresh, closed) uint8 work buffers for a crop shape"""
+        buffers = self._scratch.get(shape)
+        if buffers is None:
+            buffers = tuple(np.empty(shape, np.uint8) for _ in range(4))
+            self._scratch[shape] = buffers
+        return buffers
         
     def display_current_frame(self):
         """Display current frame with detection overlay"""
@@ -375,19 +450,21 @@ class PupilDetectionTuner:
         center_x, center_y = width // 2, height // 2
         
         # Draw detected pupils
-        for i, pupil in enumerate(detected_pupils):
+        for i in range(len(detected_pupils)):
             color = (0, 255, 0) if i == 0 else (0, 255, 255)  # Best in green, others in yellow
+            x, y = int(detected_pupils.x[i]), int(detected_pupils.y[i])
+            major_axis = float(detected_pupils.major_axis[i])
             
             # Draw ellipse
-            ellipse = ((pupil['x'], pupil['y']), (pupil['major_axis'], pupil['minor_axis']), pupil['angle'])
+            ellipse = ((x, y), (major_axis, float(detected_pupils.minor_axis[i])), float(detected_pupils.angle[i]))
             cv2.ellipse(display_frame, ellipse, color, 2)
             
             # Draw center point
-            cv2.circle(display_frame, (pupil['x'], pupil['y']), 2, color, -1)
+            cv2.circle(display_frame, (x, y), 2, color, -1)
             
             # Add score text
-            cv2.putText(display_frame, f"{pupil['total_score']:.2f}", 
-                       (pupil['x'] + int(pupil['major_axis']/2) + 5, pupil['y']),
+            cv2.putText(display_frame, f"{detected_pupils.total[i]:.2f}", 
+                       (x + int(major_axis/2) + 5, y),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
         
         # Add parameter info overlay
@@ -417,20 +494,21 @@ class PupilDetectionTuner:
         info += f"File: {os.path.basename(frame_path)}\n"
         info += f"Detected pupils: {len(detected_pupils)}\n"
         
-        if detected_pupils:
-            best = detected_pupils[0]
-            info += f"Best: ({best['x']}, {best['y']}) R={best['r']} Score={best['total_score']:.3f}"
+        if len(detected_pupils):
+            d = detected_pupils
+            info += f"Best: ({d.x[0]}, {d.y[0]}) Size:{d.major_axis[0]:.1f}x{d.minor_axis[0]:.1f} Score={d.total[0]:.3f}"
         
         self.info_text.delete(1.0, tk.END)
         self.info_text.insert(1.0, info)
         
         # Update results
         results = "Detection Results:\n"
-        for i, pupil in enumerate(detected_pupils[:3]):  # Show top 3
-            results += f"{i+1}. Pos:({pupil['x']},{pupil['y']}) "
-            results += f"Size:{pupil['major_axis']:.1f}x{pupil['minor_axis']:.1f} "
-            results += f"Area:{pupil['area']} "
-            results += f"Score:{pupil['total_score']:.3f}\n"
+        d = detected_pupils
+        for i in range(min(3, len(d))):  # Show top 3
+            results += f"{i+1}. Pos:({d.x[i]},{d.y[i]}) "
+            results += f"Size:{d.major_axis[i]:.1f}x{d.minor_axis[i]:.1f} "
+            results += f"Area:{d.area[i]} "
+            results += f"Score:{d.total[i]:.3f}\n"
         
         self.results_text.delete(1.0, tk.END)
         self.results_text.insert(1.0, results)
@@ -441,24 +519,31 @@ class PupilDetectionTuner:
         self.play_button.config(text="Pause" if self.playing else "Play")
         
         if self.playing:
+            self._next_deadline = time.monotonic()
             self.play_frames()
             
     def play_frames(self):
-        """Play frames automatically"""
+        """Play frames automatically at a fixed rate, dropping frames when behind"""
         if not self.playing:
             return
             
         self.display_current_frame()
         
-        # Advance frame
-        self.current_frame_idx += 1
+        # Advance frame, skipping frames whose deadline has already passed
+        dt = self.play_speed / 1000.0
+        behind = time.monotonic() - self._next_deadline
+        step = max(1, int(behind / dt) + 1)
+        self._next_deadline += step * dt
+        
+        self.current_frame_idx += step
         if self.current_frame_idx >= len(self.frames):
             self.current_frame_idx = 0
             
         self.frame_var.set(self.current_frame_idx)
         
-        # Schedule next frame
-        self.root.after(self.play_speed, self.play_frames)
+        # Schedule next frame against the deadline instead of a fixed delay
+        delay_ms = max(1, int((self._next_deadline - time.monotonic()) * 1000))
+        self.root.after(delay_ms, self.play_frames)
         
     def reset_playback(self):
         """Reset playback to beginning"""
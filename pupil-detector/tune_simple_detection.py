@@ -8,12 +8,56 @@ from typing import Tuple, Optional, List
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import time
+import threading
+import queue
+import traceback
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # Fall back to NumPy scoring
+
+
+def _score_candidates_numpy(xs, ys, areas, circularities, center_x, center_y, half_size,
+                            center_weight, size_weight, circularity_weight):
+    """Return (distances, center_scores, size_scores, total_scores) for fitted blobs"""
+    distances = np.hypot(xs - center_x, ys - center_y)
+    center_scores = 1.0 - distances / half_size
+    size_scores = 1.0 - np.abs(areas - 10000) / 10000  # Prefer medium size
+    total_scores = (center_scores * center_weight +
+                    size_scores * size_weight +
+                    circularities * circularity_weight)
+    return distances, center_scores, size_scores, total_scores
+
+
+def _score_candidates_loop(xs, ys, areas, circularities, center_x, center_y, half_size,
+                           center_weight, size_weight, circularity_weight):
+    """Single fused loop version of _score_candidates_numpy, compiled with numba"""
+    n = xs.shape[0]
+    distances = np.empty(n)
+    center_scores = np.empty(n)
+    size_scores = np.empty(n)
+    total_scores = np.empty(n)
+    for i in range(n):
+        distance = np.hypot(xs[i] - center_x, ys[i] - center_y)
+        center_score = 1.0 - distance / half_size
+        size_score = 1.0 - abs(areas[i] - 10000) / 10000  # Prefer medium size
+        distances[i] = distance
+        center_scores[i] = center_score
+        size_scores[i] = size_score
+        total_scores[i] = (center_score * center_weight +
+                           size_score * size_weight +
+                           circularities[i] * circularity_weight)
+    return distances, center_scores, size_scores, total_scores
+
+
+_score_candidates = njit(cache=True)(_score_candidates_loop) if njit else _score_candidates_numpy
 
 class SimplePupilDetectionTuner:
     def __init__(self, root):
         self.root = root
         self.root.title("Simple Pupil Detection Tuner")
-        self.root.geometry("800x600")
+        self.root.geometry("1480x760")
         
         # Detection parameters (with defaults)
         self.params = {
@@ -34,16 +78,34 @@ class SimplePupilDetectionTuner:
         self.current_recording_idx = 0
         self.current_frame_idx = 0
         self.frames = []
+        self.frame_images = []  # Decoded frames, filled lazily per recording
+        self._gray_cache = {}   # frame index -> grayscale frame
+        self._mask_cache = {}   # radius -> circular mask sized to the ROI box
+        self._scratch = {}      # ROI shape -> reusable pipeline buffers
         self.playing = False
         self.play_speed = 100  # ms between frames
+        self._next_deadline = 0.0  # monotonic time the next playback frame is due
         self.current_frame = None
+        self._pending_redraw = None  # Tk after() id of a scheduled redraw
+        self._last_info = ''         # Text last written to info_text
+        self._last_results = ''      # Text last written to results_text
+        self._blur_kernels = None    # Separable contrast+blur kernels...
+        self._blur_kernels_key = None  # ...and the (alpha, ksize) they were built for
+        self.detect_scale = 2  # Detection runs on frames downscaled by this factor
+        morph_size = (5 // self.detect_scale) | 1  # 5x5 at full resolution
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (morph_size, morph_size))
+        
+        # Detection runs on a worker thread; both queues hold only the latest item
+        self._state_lock = threading.Lock()  # Guards recording/frame caches
+        self._job_q = queue.Queue(maxsize=1)
+        self._result_q = queue.Queue(maxsize=1)
+        threading.Thread(target=self._detect_worker, daemon=True).start()
         
         self.setup_ui()
         self.load_recordings()
         
-        # Create OpenCV window for display
-        cv2.namedWindow("Simple Pupil Detection", cv2.WINDOW_NORMAL)
-        cv2.resizeWindow("Simple Pupil Detection", 640, 480)
+        # Pick up worker results on the Tk thread
+        self.root.after(15, self._poll_results)
         
     def setup_ui(self):
         """Setup the user interface"""
@@ -51,7 +113,14 @@ class SimplePupilDetectionTuner:
         main_frame = ttk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        self.setup_controls(main_frame)
+        # Frame preview with detection overlay (fed PPM data, no OpenCV window)
+        self.preview_img = tk.PhotoImage(width=640, height=480)
+        self.preview_label = ttk.Label(main_frame, image=self.preview_img)
+        self.preview_label.pack(side=tk.LEFT, anchor=tk.N, padx=(0, 10))
+        
+        controls_frame = ttk.Frame(main_frame)
+        controls_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.setup_controls(controls_frame)
         
     def setup_controls(self, parent):
         """Setup control panel with sliders"""
@@ -97,6 +166,7 @@ class SimplePupilDetectionTuner:
         
         # Create sliders for each parameter in a grid
         self.param_vars = {}
+        self.label_vars = {}
         param_configs = [
             ('contrast_alpha', 'Contrast Alpha', 1.0, 4.0, 0.1),
             ('contrast_beta', 'Contrast Beta', -100, 50, 5),
@@ -143,12 +213,12 @@ class SimplePupilDetectionTuner:
                           orient=tk.HORIZONTAL, command=lambda v, p=param: self.on_param_changed(p, v))
         slider.pack(fill=tk.X)
         
-        # Value label
-        value_label = ttk.Label(frame, text=f"{self.params[param]}")
-        value_label.pack(anchor=tk.W)
+        # Value label, driven by a StringVar so updates don't reconfigure the widget
+        text_var = tk.StringVar(value=f"{self.params[param]}")
+        ttk.Label(frame, textvariable=text_var).pack(anchor=tk.W)
         
         # Store reference to update label
-        setattr(self, f"{param}_label", value_label)
+        self.label_vars[param] = text_var
         
         # Configure column weights
         parent.columnconfigure(col, weight=1)
@@ -205,7 +275,14 @@ class SimplePupilDetectionTuner:
             return
             
         recording = self.recordings[self.current_recording_idx]
-        self.frames = recording['frames']
+        with self._state_lock:
+            self.frames = recording['frames']
+            self.frame_images = [None] * len(self.frames)
+            self._gray_cache = {}
+            
+        # Decode the rest of the recording in the background
+        threading.Thread(target=self._prefetch_frames,
+                         args=(self.frames, self.frame_images), daemon=True).start()
         
         # Update frame scale
         self.frame_scale.configure(to=len(self.frames) - 1)
@@ -233,7 +310,7 @@ class SimplePupilDetectionTuner:
         """Handle frame slider change"""
         self.current_frame_idx = int(float(value))
         if not self.playing:
-            self.display_current_frame()
+            self.schedule_redraw()
             
     def on_speed_changed(self, value):
         """Handle play speed change"""
@@ -251,98 +328,198 @@ class SimplePupilDetectionTuner:
             self.params[param] = float(value)
         
         # Update value label
-        label = getattr(self, f"{param}_label", None)
-        if label:
-            label.config(text=f"{self.params[param]:.3f}")
+        text_var = self.label_vars.get(param)
+        if text_var:
+            text_var.set(f"{self.params[param]:.3f}")
         
         # Update display if not playing
         if not self.playing:
-            self.display_current_frame()
+            self.schedule_redraw()
             
-    def detect_pupil_simple(self, frame):
-        """Simple pupil detection using contrast enhancement and black blob detection"""
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        # Apply contrast enhancement
-        enhanced = cv2.convertScaleAbs(gray, 
-                                     alpha=self.params['contrast_alpha'], 
-                                     beta=self.params['contrast_beta'])
+    def schedule_redraw(self, delay_ms=30):
+        """Coalesce bursts of slider events into a single redraw after delay_ms"""
+        if self._pending_redraw is not None:
+            self.root.after_cancel(self._pending_redraw)
+        self._pending_redraw = self.root.after(delay_ms, self._do_redraw)
+        
+    def _do_redraw(self):
+        """Run the redraw scheduled by schedule_redraw"""
+        self._pending_redraw = None
+        self.display_current_frame()
         
-        # Apply blur
-        kernel_size = int(self.params['blur_kernel'])
-        if kernel_size % 2 == 0:
-            kernel_size += 1
-        blurred = cv2.GaussianBlur(enhanced, (kernel_size, kernel_size), 0)
+    def get_frame(self, frame_idx, frames, images):
+        """Return decoded frame of a recording, decoding from disk only on first access"""
+        frame = images[frame_idx]
+        if frame is None:
+            frame = cv2.imread(frames[frame_idx])
+            images[frame_idx] = frame
+        return frame
+        
+    def _prefetch_frames(self, frames, images):
+        """Background thread: decode every frame of a recording into images"""
+        for i, path in enumerate(frames):
+            if self.frame_images is not images:
+                return  # Another recording was selected
+            if images[i] is not None:
+                continue
+            frame = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+            with self._state_lock:
+                if images[i] is None:
+                    images[i] = frame
+                    
+    def get_gray(self, frame_idx, frame, gray_cache):
+        """Return grayscale frame at detection resolution, converted once per frame"""
+        gray = gray_cache.get(frame_idx)
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            if self.detect_scale > 1:
+                height, width = gray.shape
+                gray = cv2.resize(gray, (width // self.detect_scale, height // self.detect_scale),
+                                  interpolation=cv2.INTER_AREA)
+            gray_cache[frame_idx] = gray
+        return gray
+        
+    def get_roi_mask(self, radius):
+        """Return circular mask filling a (2r+1)x(2r+1) ROI box, built once per radius"""
+        mask = self._mask_cache.get(radius)
+        if mask is None:
+            size = 2 * radius + 1
+            mask = np.zeros((size, size), dtype=np.uint8)
+            cv2.circle(mask, (radius, radius), radius, 255, -1)
+            self._mask_cache[radius] = mask
+        return mask
+        
+    def get_scratch_buffers(self, shape):
+        """Return (int16, uint8, uint8, uint8) work buffers for the detection pipeline"""
+        buffers = self._scratch.get(shape)
+        if buffers is None:
+            buffers = (np.empty(shape, np.int16), np.empty(shape, np.uint8),
+                       np.empty(shape, np.uint8), np.empty(shape, np.uint8))
+            self._scratch[shape] = buffers
+        return buffers
+        
+    def get_contrast_blur_kernels(self, alpha, kernel_size):
+        """Return (kernel_x, kernel_y) Gaussian kernels with the contrast gain folded into X"""
+        key = (alpha, kernel_size)
+        if self._blur_kernels_key != key:
+            kernel = cv2.getGaussianKernel(kernel_size, 0).astype(np.float32)
+            self._blur_kernels = (kernel * np.float32(alpha), kernel)
+            self._blur_kernels_key = key
+        return self._blur_kernels
+        
+    def detect_pupil_simple(self, gray, params=None):
+        """Simple pupil detection using contrast enhancement and black blob detection"""
+        if params is None:
+            params = self.params
+            
+        # gray is downscaled by detect_scale (see get_gray); all measurements
+        # below are converted back to full-frame units
+        scale = self.detect_scale
         
-        # Create center mask
+        # Crop to the bounding box of the central search circle
         height, width = gray.shape
         center_x, center_y = width // 2, height // 2
-        mask = np.zeros((height, width), dtype=np.uint8)
-        cv2.circle(mask, (center_x, center_y), min(width, height) // 3, 255, -1)
+        radius = min(width, height) // 3
+        x0, y0 = center_x - radius, center_y - radius
+        roi = gray[y0:y0 + 2 * radius + 1, x0:x0 + 2 * radius + 1]
         
-        # Apply mask
-        masked = cv2.bitwise_and(blurred, mask)
+        # Apply contrast gain and blur in one separable filter pass, then the
+        # brightness offset with saturation (replaces convertScaleAbs + GaussianBlur)
+        kernel_size = (int(params['blur_kernel']) // scale) | 1  # Same extent as at full size
+        kernel_x, kernel_y = self.get_contrast_blur_kernels(params['contrast_alpha'], kernel_size)
         
-        # Binary threshold to find dark regions
-        _, thresh = cv2.threshold(masked, self.params['threshold_value'], 255, cv2.THRESH_BINARY_INV)
+        # Every stage writes into preallocated buffers, so the returned thresh and
+        # enhanced images are only valid until the next call
+        scaled, enhanced, thresh, closed = self.get_scratch_buffers(roi.shape)
+        cv2.sepFilter2D(roi, cv2.CV_16S, kernel_x, kernel_y, dst=scaled)
+        cv2.convertScaleAbs(scaled, dst=enhanced, alpha=1.0, beta=params['contrast_beta'])
         
-        # Morphological operations to clean up
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-        thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
-        
-        # Find contours
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Binary threshold to find dark regions
+        cv2.threshold(enhanced, params['threshold_value'], 255, cv2.THRESH_BINARY_INV, dst=thresh)
         
-        detected_pupils = []
+        # Keep only the central circle (mask cached per radius)
+        cv2.bitwise_and(thresh, self.get_roi_mask(radius), dst=thresh)
         
-        for contour in contours:
-            # Filter by area
-            area = cv2.contourArea(contour)
-            min_area = int(self.params['min_area'])
-            max_area = int(self.params['max_area'])
+        # Morphological operations to clean up
+        cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, self._morph_kernel, dst=closed)
+        cv2.morphologyEx(closed, cv2.MORPH_OPEN, self._morph_kernel, dst=thresh)
+        
+        # Fill holes (background not reachable from the ROI border) into closed, so
+        # a blob inside another blob's hole merges into it as with RETR_EXTERNAL
+        padded = cv2.copyMakeBorder(thresh, 1, 1, 1, 1, cv2.BORDER_CONSTANT, value=0)
+        cv2.floodFill(padded, None, (0, 0), 255)
+        cv2.bitwise_not(padded[1:-1, 1:-1], dst=closed)
+        cv2.bitwise_or(closed, thresh, dst=closed)
+        
+        # Label the filled blobs in one pass; a solid blob's pixel count bounds its
+        # contour area from above, so blobs too small to reach min_area are dropped
+        # before tracing
+        _, labels, stats, _ = cv2.connectedComponentsWithStats(closed, connectivity=8)
+        large = np.flatnonzero(stats[1:, cv2.CC_STAT_AREA] * scale ** 2 >= params['min_area']) + 1
+        
+        # Trace only the remaining blobs (offset back to downscaled-frame coordinates)
+        contours = []
+        for label in large:
+            x, y, w, h = (int(v) for v in stats[label, :4])
+            blob = (labels[y:y + h, x:x + w] == label).view(np.uint8)
+            found, _ = cv2.findContours(blob, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                        offset=(x0 + x, y0 + y))
+            contours.extend(found)
+        
+        # Cheap per-contour measurements, filtered in one vectorized pass so that
+        # fitEllipse only runs on plausible blobs
+        count = len(contours)
+        areas = np.fromiter((cv2.contourArea(c) for c in contours), dtype=np.float64, count=count) * scale ** 2
+        perimeters = np.fromiter((cv2.arcLength(c, True) for c in contours), dtype=np.float64, count=count) * scale
+        num_points = np.fromiter((len(c) for c in contours), dtype=np.int64, count=count)
+        circularities = np.divide(4 * np.pi * areas, perimeters ** 2,
+                                  out=np.zeros_like(areas), where=perimeters > 0)
+        
+        candidates = ((areas >= int(params['min_area'])) &
+                      (areas <= int(params['max_area'])) &
+                      (perimeters > 0) &
+                      (circularities >= params['min_circularity']) &
+                      (num_points >= 5))  # Need at least 5 points for ellipse fitting
+        
+        # Fit ellipses to the survivors (fitEllipse can still reject odd shapes)
+        kept, ellipses = [], []
+        for i in np.flatnonzero(candidates):
+            try:
+                (x, y), (major_axis, minor_axis), angle = cv2.fitEllipse(contours[i])
+                ellipses.append(((x * scale, y * scale), (major_axis * scale, minor_axis * scale), angle))
+            except cv2.error:
+                continue  # Skip if ellipse fitting fails
+            kept.append(i)
+        
+        if not kept:
+            return [], thresh, enhanced
             
-            if min_area <= area <= max_area:
-                # Calculate circularity
-                perimeter = cv2.arcLength(contour, True)
-                if perimeter > 0:
-                    circularity = 4 * np.pi * area / (perimeter ** 2)
-                    
-                    # Filter by circularity
-                    if circularity >= self.params['min_circularity']:
-                        # Fit ellipse
-                        if len(contour) >= 5:
-                            try:
-                                ellipse = cv2.fitEllipse(contour)
-                                (x, y), (major_axis, minor_axis), angle = ellipse
-                                
-                                # Calculate distance from center
-                                distance_from_center = np.sqrt((x - center_x)**2 + (y - center_y)**2)
-                                
-                                # Calculate scores
-                                center_score = 1.0 - (distance_from_center / (min(width, height) / 2))
-                                size_score = 1.0 - abs(area - 10000) / 10000  # Prefer medium size
-                                circularity_score = circularity
-                                
-                                # Combined score
-                                total_score = (center_score * self.params['center_weight'] + 
-                                             size_score * self.params['size_weight'] + 
-                                             circularity_score * self.params['circularity_weight'])
-                                
-                                detected_pupils.append({
-                                    'x': int(x), 'y': int(y), 
-                                    'major_axis': major_axis, 'minor_axis': minor_axis,
-                                    'angle': angle, 'area': area,
-                                    'circularity': circularity,
-                                    'center_score': center_score,
-                                    'size_score': size_score,
-                                    'total_score': total_score,
-                                    'distance': distance_from_center,
-                                    'contour': contour
-                                })
-                            except:
-                                continue  # Skip if ellipse fitting fails
+        # Score all fitted blobs at once
+        kept = np.array(kept)
+        centers = np.array([e[0] for e in ellipses])
+        kept_areas = areas[kept]
+        kept_circularities = circularities[kept]
+        distances, center_scores, size_scores, total_scores = _score_candidates(
+            centers[:, 0], centers[:, 1], kept_areas, kept_circularities,
+            float(center_x * scale), float(center_y * scale), min(width, height) * scale / 2,
+            float(params['center_weight']), float(params['size_weight']),
+            float(params['circularity_weight']))
+        
+        detected_pupils = [{
+            'x': int(x), 'y': int(y),
+            'major_axis': major_axis, 'minor_axis': minor_axis,
+            'angle': angle, 'area': area,
+            'circularity': circularity,
+            'center_score': center_score,
+            'size_score': size_score,
+            'total_score': total_score,
+            'distance': distance,
+            'contour': contours[i] * scale
+        } for i, ((x, y), (major_axis, minor_axis), angle), area, circularity,
+              center_score, size_score, total_score, distance
+          in zip(kept, ellipses, kept_areas.tolist(), kept_circularities.tolist(),
+                 center_scores.tolist(), size_scores.tolist(), total_scores.tolist(),
+                 distances.tolist())]
         
         # Sort by total score
         detected_pupils.sort(key=lambda p: p['total_score'], reverse=True)
@@ -350,18 +527,77 @@ class SimplePupilDetectionTuner:
         return detected_pupils, thresh, enhanced
         
     def display_current_frame(self):
-        """Display current frame with detection overlay"""
+        """Queue current frame for detection, replacing any job not yet started"""
         if not self.frames or self.current_frame_idx >= len(self.frames):
             return
             
-        # Load frame
-        frame_path = self.frames[self.current_frame_idx]
-        frame = cv2.imread(frame_path)
+        job = (self.current_frame_idx, dict(self.params))
+        try:
+            self._job_q.get_nowait()
+        except queue.Empty:
+            pass
+        self._job_q.put_nowait(job)
+        
+    def _detect_worker(self):
+        """Worker thread: run detection and draw the overlay for queued frames"""
+        while True:
+            frame_idx, params = self._job_q.get()
+            try:
+                # Take references to the current recording's frames and caches; a
+                # newly loaded recording replaces them, so rendering needs no lock
+                with self._state_lock:
+                    if frame_idx >= len(self.frames):
+                        continue
+                    recording = (self.frames, self.frame_images, self._gray_cache)
+                result = self.render_frame(frame_idx, params, *recording)
+                if result is None:
+                    continue
+                    
+                # Encode for Tk here so the Tk thread only has to load the pixels
+                ppm_data = cv2.imencode('.ppm', result[2])[1].tobytes()
+                result += (ppm_data,)
+            except Exception:
+                # Keep the worker alive so later frame and slider changes still render
+                print(f"Detection failed on frame {frame_idx}:")
+                traceback.print_exc()
+                continue
+                
+            # Latest wins: drop a result the Tk thread has not picked up yet
+            try:
+                self._result_q.get_nowait()
+            except queue.Empty:
+                pass
+            self._result_q.put_nowait(result)
+            
+    def _poll_results(self):
+        """Show the newest worker result, if any, then re-arm"""
+        try:
+            frame_idx, frame_path, display_frame, detected_pupils, ppm_data = self._result_q.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            # Store current frame
+            self.current_frame = display_frame
+            
+            # Display in the preview label
+            self.preview_img.configure(data=ppm_data, format='PPM')
+            
+            # Update info display
+            self.update_info_display(detected_pupils, frame_path, frame_idx)
+            
+        self.root.after(15, self._poll_results)
+        
+    def render_frame(self, frame_idx, params, frames, images, gray_cache):
+        """Detect pupils on a frame and draw the overlay; returns None if unreadable"""
+        # Load frame (cached after first decode)
+        frame_path = frames[frame_idx]
+        frame = self.get_frame(frame_idx, frames, images)
         if frame is None:
-            return
+            return None
             
         # Detect pupils
-        detected_pupils, thresh, enhanced = self.detect_pupil_simple(frame)
+        gray = self.get_gray(frame_idx, frame, gray_cache)
+        detected_pupils, thresh, enhanced = self.detect_pupil_simple(gray, params)
         
         # Create display frame
         display_frame = frame.copy()
@@ -388,28 +624,20 @@ class SimplePupilDetectionTuner:
         
         # Add parameter info overlay
         y_offset = 30
-        cv2.putText(display_frame, f"Contrast: {self.params['contrast_alpha']:.1f}", (10, y_offset), 
+        cv2.putText(display_frame, f"Contrast: {params['contrast_alpha']:.1f}", (10, y_offset), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         y_offset += 20
-        cv2.putText(display_frame, f"Threshold: {self.params['threshold_value']}", (10, y_offset), 
+        cv2.putText(display_frame, f"Threshold: {params['threshold_value']}", (10, y_offset), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         y_offset += 20
-        cv2.putText(display_frame, f"Area: {self.params['min_area']}-{self.params['max_area']}", (10, y_offset), 
+        cv2.putText(display_frame, f"Area: {params['min_area']}-{params['max_area']}", (10, y_offset), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
-        # Store current frame
-        self.current_frame = display_frame
-        
-        # Display in OpenCV window
-        cv2.imshow("Simple Pupil Detection", display_frame)
-        cv2.waitKey(1)  # Process window events
+        return frame_idx, frame_path, display_frame, detected_pupils
         
-        # Update info display
-        self.update_info_display(detected_pupils, frame_path)
-        
-    def update_info_display(self, detected_pupils, frame_path):
+    def update_info_display(self, detected_pupils, frame_path, frame_idx):
         """Update information display"""
-        info = f"Frame: {self.current_frame_idx + 1}/{len(self.frames)}\n"
+        info = f"Frame: {frame_idx + 1}/{len(self.frames)}\n"
         info += f"File: {os.path.basename(frame_path)}\n"
         info += f"Detected pupils: {len(detected_pupils)}\n"
         
@@ -417,8 +645,9 @@ class SimplePupilDetectionTuner:
             best = detected_pupils[0]
             info += f"Best: ({best['x']}, {best['y']}) Size:{best['major_axis']:.1f}x{best['minor_axis']:.1f} Score={best['total_score']:.3f}"
         
-        self.info_text.delete(1.0, tk.END)
-        self.info_text.insert(1.0, info)
+        if info != self._last_info:
+            self.info_text.replace(1.0, tk.END, info)
+            self._last_info = info
         
         # Update results
         results = "Detection Results:\n"
@@ -429,8 +658,9 @@ class SimplePupilDetectionTuner:
             results += f"Circ:{pupil['circularity']:.3f} "
             results += f"Score:{pupil['total_score']:.3f}\n"
         
-        self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(1.0, results)
+        if results != self._last_results:
+            self.results_text.replace(1.0, tk.END, results)
+            self._last_results = results
         
     def toggle_play(self):
         """Toggle playback"""
@@ -438,24 +668,31 @@ class SimplePupilDetectionTuner:
         self.play_button.config(text="Pause" if self.playing else "Play")
         
         if self.playing:
+            self._next_deadline = time.monotonic()
             self.play_frames()
             
     def play_frames(self):
-        """Play frames automatically"""
+        """Play frames automatically at a fixed rate, dropping frames when behind"""
         if not self.playing:
             return
             
         self.display_current_frame()
         
-        # Advance frame
-        self.current_frame_idx += 1
+        # Advance frame, skipping frames whose deadline has already passed
+        dt = self.play_speed / 1000.0
+        behind = time.monotonic() - self._next_deadline
+        step = max(1, int(behind / dt) + 1)
+        self._next_deadline += step * dt
+        
+        self.current_frame_idx += step
         if self.current_frame_idx >= len(self.frames):
             self.current_frame_idx = 0
             
         self.frame_var.set(self.current_frame_idx)
         
-        # Schedule next frame
-        self.root.after(self.play_speed, self.play_frames)
+        # Schedule next frame against the deadline instead of a fixed delay
+        delay_ms = max(1, int((self._next_deadline - time.monotonic()) * 1000))
+        self.root.after(delay_ms, self.play_frames)
         
     def reset_playback(self):
         """Reset playback to beginning"""
@@ -486,7 +723,6 @@ def main():
     app = SimplePupilDetectionTuner(root)
     
     def on_closing():
-        cv2.destroyAllWindows()
         root.destroy()
     
     root.protocol("WM_DELETE_WINDOW", on_closing)
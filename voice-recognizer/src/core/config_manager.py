@@ -8,6 +8,13 @@ import yaml
 import logging
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml parser, when PyYAML was built with it
+except ImportError:
+    from yaml import SafeLoader
+
+_MISSING = object()  # Cached marker for keys absent from the configuration
+
 
 class ConfigManager:
     """Manages configuration settings for the voice recognition system"""
@@ -16,6 +23,7 @@ class ConfigManager:
         """Initialize configuration manager"""
         self.config_file = config_file
         self.config = {}
+        self._cache = {}  # Dotted key -> resolved value, cleared whenever the file is loaded
         self.logger = logging.getLogger(__name__)
         self.load_config()
     
@@ -32,7 +40,8 @@ class ConfigManager:
                 raise FileNotFoundError(f"Configuration file not found: {config_path}")
             
             with open(config_path, 'r', encoding='utf-8') as file:
-                self.config = yaml.safe_load(file)
+                self.config = yaml.load(file, Loader=SafeLoader)
+            self._cache.clear()
             
             self.logger.info(f"Configuration loaded from {config_path}")
             
@@ -45,15 +54,24 @@ class ConfigManager:
     
     def get(self, key, default=None):
         """Get configuration value by key"""
-        keys = key.split('.')
-        value = self.config
-        
         try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+            value = self._cache[key]
+        except KeyError:
+            value = self.config
+            try:
+                for k in key.split('.'):
+                    value = value[k]
+            except (KeyError, TypeError):
+                value = _MISSING
+            self._cache[key] = value
+        
+        return default if value is _MISSING else value
+    
+    def _invalidate(self, section):
+        """Drop cached lookups of a section whose values were changed in place"""
+        prefix = section + '.'
+        for key in [k for k in self._cache if k == section or k.startswith(prefix)]:
+            del self._cache[key]
     
     def get_audio_config(self):
         """Get audio configuration"""
@@ -91,6 +109,7 @@ class ConfigManager:
             
             if os.path.exists(language_model_path):
                 voice_config['model_path'] = language_model_path
+                self._invalidate('voice')  # Cached 'voice.*' lookups predate this write
                 self.logger.info(f"Using {language} model at: {language_model_path}")
             else:
                 self.logger.warning(f"Model not found for language '{language}' at: {language_model_path}")